@@ -15,6 +15,34 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 from features.sms_service import sms_service, farmer_manager, FarmerContact, SMSRequest
 
+# Sample farmers used by the demo (built once at import)
+_SAMPLE_FARMERS = (
+    FarmerContact(
+        name="Tesfa Bekele",
+        phone_number="+251966123456",
+        location="Hawassa",
+        latitude=7.0469,
+        longitude=38.4762,
+        preferred_language="amharic"
+    ),
+    FarmerContact(
+        name="Meron Haile",
+        phone_number="+251977234567",
+        location="Hawassa",
+        latitude=7.0500,
+        longitude=38.4800,
+        preferred_language="english"
+    ),
+    FarmerContact(
+        name="Diriba Gutema",
+        phone_number="+251988345678",
+        location="Adama",
+        latitude=8.5400,
+        longitude=39.2675,
+        preferred_language="afaan_oromo"
+    )
+)
+
 def print_header(title):
     """Print a formatted header"""
     print("\n" + "="*60)
@@ -33,34 +61,7 @@ def demo_farmer_management():
     # Test adding farmers
     print_section("Adding Sample Farmers")
     
-    sample_farmers = [
-        FarmerContact(
-            name="Tesfa Bekele",
-            phone_number="+251966123456",
-            location="Hawassa",
-            latitude=7.0469,
-            longitude=38.4762,
-            preferred_language="amharic"
-        ),
-        FarmerContact(
-            name="Meron Haile",
-            phone_number="+251977234567",
-            location="Hawassa",
-            latitude=7.0500,
-            longitude=38.4800,
-            preferred_language="english"
-        ),
-        FarmerContact(
-            name="Diriba Gutema",
-            phone_number="+251988345678",
-            location="Adama",
-            latitude=8.5400,
-            longitude=39.2675,
-            preferred_language="afaan_oromo"
-        )
-    ]
-    
-    for farmer in sample_farmers:
+    for farmer in _SAMPLE_FARMERS:
         success = farmer_manager.add_farmer(farmer)
         status = "✅ Added" if success else "❌ Failed"
         print(f"{status}: {farmer.name} ({farmer.location}) - {farmer.phone_number}")
@@ -151,33 +152,34 @@ AlphaEarth Gorsaa Qonnaa"""
     
     print(f"📍 Testing SMS to {len(farmers)} farmers in {test_location}")
     
-    # Send test SMS to each farmer in their preferred language
-    for farmer in farmers:
-        print(f"\n👤 Sending to {farmer.name} ({farmer.preferred_language})...")
-        
-        advice_text = sample_advice.get(farmer.preferred_language, sample_advice['english'])
-        
-        sms_request = SMSRequest(
+    # Build one SMS request per farmer in their preferred language, grouped by language
+    farmers = sorted(farmers, key=lambda f: f.preferred_language)
+    sms_requests = [
+        SMSRequest(
             phone_number=farmer.phone_number,
-            message=advice_text,
+            message=sample_advice.get(farmer.preferred_language, sample_advice['english']),
             language=farmer.preferred_language,
             location=test_location
         )
-        
-        # Note: This will actually send SMS if Twilio is configured
-        # For demo purposes, you might want to comment this out
-        # sms_response = sms_service.send_agricultural_advice(sms_request)
-        
-        # Simulated response for demo
-        print(f"   📱 SMS prepared for {farmer.phone_number}")
-        print(f"   🌐 Language: {farmer.preferred_language}")
-        print(f"   📝 Message length: {len(advice_text)} characters")
-        
-        # Uncomment below to actually send SMS:
-        # if sms_response.success:
-        #     print(f"   ✅ SMS sent successfully! SID: {sms_response.message_sid}")
-        # else:
-        #     print(f"   ❌ SMS failed: {sms_response.error_message}")
+        for farmer in farmers
+    ]
+    
+    for farmer, sms_request in zip(farmers, sms_requests):
+        print(f"\n👤 Sending to {farmer.name} ({farmer.preferred_language})...")
+        print(f"   📱 SMS prepared for {sms_request.phone_number}")
+        print(f"   🌐 Language: {sms_request.language}")
+        print(f"   📝 Message length: {len(sms_request.message)} characters")
+    
+    # Note: This will actually send SMS if Twilio is configured
+    # All requests are dispatched concurrently in a single batch
+    # sms_responses = sms_service.send_agricultural_advice_bulk(sms_requests)
+    
+    # Uncomment below to actually send SMS:
+    # for farmer, sms_response in zip(farmers, sms_responses):
+    #     if sms_response.success:
+    #         print(f"   ✅ SMS sent to {farmer.name}! SID: {sms_response.message_sid}")
+    #     else:
+    #         print(f"   ❌ SMS to {farmer.name} failed: {sms_response.error_message}")
 
 def demo_web_api_integration():
     """Demonstrate web API integration"""
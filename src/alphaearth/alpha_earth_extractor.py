@@ -3,8 +3,9 @@ Simplified AlphaEarth Extractor that works with existing Earth Engine integratio
 """
 
 import numpy as np
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +18,9 @@ class AlphaEarthExtractor:
         """Initialize the extractor"""
         self.service_account_key = service_account_key
         self.project_id = project_id
+        # Whether Earth Engine is usable; None until the first extraction probes it
+        self._use_real_ee = None
+        self._select_lock = threading.Lock()
         
         # Try to import and use our existing Earth Engine integration
         try:
@@ -25,25 +29,57 @@ class AlphaEarthExtractor:
                 service_account_key=service_account_key,
                 project_id=project_id
             )
-            self.use_real_ee = True
-            logger.info(f"Using real Earth Engine integration (project: {project_id})")
         except Exception as e:
             logger.warning(f"Earth Engine not available, using mock: {e}")
-            try:
-                import sys
-                from pathlib import Path
-                # Add tests to path for mock fallback
-                tests_path = Path(__file__).parent.parent.parent / "tests"
-                if str(tests_path) not in sys.path:
-                    sys.path.append(str(tests_path))
-                from test_with_mock_ee import MockAlphaEarthFeatureExtractor
-                self.ee_extractor = MockAlphaEarthFeatureExtractor()
-                self.use_real_ee = False
-            except ImportError:
-                # Fallback if test module not available
-                logger.error("No fallback extractor available")
+            if not self._use_mock():
                 raise e
     
+    def _use_mock(self) -> bool:
+        """Switch to the mock extractor; False if the test module isn't available"""
+        try:
+            import sys
+            from pathlib import Path
+            # Add tests to path for mock fallback
+            tests_path = Path(__file__).parent.parent.parent / "tests"
+            if str(tests_path) not in sys.path:
+                sys.path.append(str(tests_path))
+            from test_with_mock_ee import MockAlphaEarthFeatureExtractor
+            self.ee_extractor = MockAlphaEarthFeatureExtractor()
+            self._use_real_ee = False
+            return True
+        except ImportError:
+            # Fallback if test module not available
+            logger.error("No fallback extractor available")
+            return False
+    
+    @property
+    def use_real_ee(self) -> bool:
+        """Whether features come from real Earth Engine (probed on first use, not at construction)"""
+        self._select_extractor()
+        return self._use_real_ee
+    
+    def _select_extractor(self):
+        """
+        Probe Earth Engine on first use and pick the extractor
+        
+        Earth Engine initializes lazily, so the probe runs here rather than in
+        __init__; missing credentials then fall back to the mock instead of
+        being reported as real data.
+        """
+        if self._use_real_ee is not None:
+            return self.ee_extractor
+        with self._select_lock:
+            if self._use_real_ee is None:
+                if self.ee_extractor.ee_available():
+                    self._use_real_ee = True
+                    logger.info(f"Using real Earth Engine integration (project: {self.project_id})")
+                else:
+                    logger.warning("Earth Engine could not be initialized, using mock")
+                    if not self._use_mock():
+                        # Keep the integration extractor's location-based features, labelled as simulated
+                        self._use_real_ee = False
+        return self.ee_extractor
+    
     def extract_agricultural_features(self, 
                                     latitude: float, 
                                     longitude: float, 
@@ -61,7 +97,7 @@ class AlphaEarthExtractor:
         """
         try:
             # Use our existing extractor
-            features = self.ee_extractor.extract_agricultural_features(
+            features = self._select_extractor().extract_agricultural_features(
                 latitude, longitude, year
             )
             
@@ -81,6 +117,32 @@ class AlphaEarthExtractor:
             # #     'rainfall': 103.5
             # # }
     
+    def extract_agricultural_features_batch(self,
+                                            points: List[Tuple[float, float]],
+                                            year: int = 2024) -> List[Dict[str, float]]:
+        """
+        Extract agricultural features for many locations in one call
+        
+        Uses the underlying extractor's batch method when it has one, and
+        extracts point by point otherwise.
+        
+        Args:
+            points: List of (latitude, longitude) tuples
+            year: Year for analysis
+            
+        Returns:
+            List of feature dictionaries, one per point in input order
+        """
+        extractor = self._select_extractor()
+        extract_batch = getattr(extractor, 'extract_agricultural_features_batch', None)
+        if extract_batch is not None:
+            return extract_batch(points, year)
+        
+        return [
+            extractor.extract_agricultural_features(latitude, longitude, year)
+            for latitude, longitude in points
+        ]
+    
     def extract_embedding_vector(self, 
                                 latitude: float, 
                                 longitude: float, 
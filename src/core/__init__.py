@@ -5,11 +5,12 @@ This module contains the core integration and Earth Engine components
 for the AlphaEarth crop recommendation system.
 """
 
-from .integration_bridge import UltraIntegrationBridge, CropRecommendationRequest
+from .integration_bridge import UltraIntegrationBridge, CropRecommendationRequest, FusedScaler
 from .earth_engine_integration import AlphaEarthFeatureExtractor
 
 __all__ = [
     'UltraIntegrationBridge',
     'CropRecommendationRequest',
+    'FusedScaler',
     'AlphaEarthFeatureExtractor'
 ]
\ No newline at end of file
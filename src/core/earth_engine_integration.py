@@ -4,10 +4,87 @@ to extract agricultural features for crop recommendation
 """
 
 import ee
+import functools
+import operator
 import numpy as np
-from typing import Tuple, Dict, Optional
+from typing import Tuple, Dict, List, Optional, Mapping, Union
 import logging
+import threading
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+# Numba is optional: without it the extraction kernel runs as plain NumPy
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        return lambda func: func
+
+# Agricultural features in the order the crop model expects them
+_FEATURE_NAMES = ('nitrogen', 'phosphorus', 'potassium', 'temperature', 'humidity', 'ph', 'rainfall')
+
+# AlphaEarth embedding bands A00..A63, and a getter pulling them out of a band dict in order
+_EMBEDDING_BANDS = tuple(f'A{i:02d}' for i in range(64))
+_bands_to_values = operator.itemgetter(*_EMBEDDING_BANDS)
+
+# Embedding-to-feature estimators, one row per feature in _FEATURE_NAMES
+_ESTIMATOR_DIMS = (
+    (1, 5, 12, 23, 34, 32, 37),   # nitrogen: vegetation/soil signatures
+    (3, 8, 15, 27, 41, 21, 22),   # phosphorus: soil signatures
+    (2, 9, 18, 31, 47, 45),       # potassium: mineral signatures
+    (6, 13, 22, 35, 52, 32),      # temperature: thermal/seasonal patterns
+    (4, 11, 19, 29, 44, 37),      # humidity: moisture/cloud patterns
+    (7, 14, 25, 38, 56, 21),      # ph: soil/mineral signatures
+    (10, 17, 26, 39, 58, 32, 45), # rainfall: precipitation patterns
+)
+_ESTIMATOR_SCALE = np.array([200.0, 150.0, 180.0, 40.0, 80.0, 4.0, 200.0])
+_ESTIMATOR_BIAS = np.array([70.0, 75.0, 105.0, 26.0, 57.0, 6.7, 159.0])
+_ESTIMATOR_VAR_SCALE = np.array([50.0, 40.0, 60.0, 15.0, 30.0, 2.0, 100.0])
+_ESTIMATOR_LO = np.array([0.0, 5.0, 5.0, 8.8, 14.3, 3.5, 20.2])
+_ESTIMATOR_HI = np.array([140.0, 145.0, 205.0, 43.7, 99.9, 9.9, 298.6])
+
+# (7, 64) averaging matrix: row i holds 1/len(dims) at feature i's embedding dimensions
+_ESTIMATOR_MEAN_MASK = np.zeros((len(_ESTIMATOR_DIMS), 64))
+for _row, _dims in enumerate(_ESTIMATOR_DIMS):
+    _ESTIMATOR_MEAN_MASK[_row, list(_dims)] = 1.0 / len(_dims)
+
+_MASK64 = (1 << 64) - 1
+
+# All Earth Engine calls here are synchronous getInfo() requests, which is the workload
+# the high-volume endpoint is provisioned for
+_EE_HIGH_VOLUME_URL = 'https://earthengine-highvolume.googleapis.com'
+
+# (service_account_key, project_id) pairs Earth Engine has been initialized with in this process
+_ee_initialized_configs = set()
+_ee_init_lock = threading.Lock()
+
+# Location-based crop zones from training data patterns, selected by coordinate hash.
+# Feature = base + slope * (hash - lower) * span, columns ordered as _FEATURE_NAMES.
+_ZONE_NAMES = ("Rice", "Maize", "Fruit", "Legume", "Tropical", "Cotton/Cash")
+_ZONE_LOWER = np.array([0.00, 0.15, 0.30, 0.45, 0.60, 0.75])
+_ZONE_UPPER = np.array([0.15, 0.30, 0.45, 0.60, 0.75, 1.00])
+_ZONE_SPAN = np.array([10.0, 10.0, 10.0, 10.0, 10.0, 4.0])
+_ZONE_BASE = np.array([
+    [85.0, 40.0, 38.0, 21.0, 80.0, 6.0, 200.0],   # Rice (15% of locations)
+    [70.0, 25.0, 15.0, 24.0, 60.0, 5.8, 80.0],    # Maize (15%)
+    [50.0, 60.0, 80.0, 18.0, 70.0, 6.5, 120.0],   # Orange/Apple (15%)
+    [30.0, 70.0, 40.0, 22.0, 65.0, 7.0, 40.0],    # Lentil, Chickpea (15%)
+    [60.0, 45.0, 100.0, 28.0, 85.0, 6.0, 180.0],  # Coconut, Banana (15%)
+    [100.0, 20.0, 50.0, 26.0, 75.0, 6.2, 60.0],   # Cotton/Cash crops (25%)
+])
+_ZONE_SLOPE = np.array([
+    [1.5, 2.0, 0.8, 0.6, 0.5, 0.15, 10.0],
+    [2.0, 2.0, 1.0, 0.4, 1.0, 0.2, 8.0],
+    [1.5, 2.0, 2.0, 0.8, 1.0, 0.1, 6.0],
+    [2.0, 1.5, 1.0, 0.5, 1.0, 0.2, 4.0],
+    [1.5, 1.0, 3.0, 0.4, 0.5, 0.3, 8.0],
+    [1.5, 2.0, 1.0, 0.6, 1.0, 0.2, 10.0],
+])
 
 class AlphaEarthFeatureExtractor:
     """
@@ -16,7 +93,10 @@ class AlphaEarthFeatureExtractor:
     
     def __init__(self, service_account_key: Optional[str] = None, project_id: Optional[str] = None):
         """
-        Initialize Earth Engine with authentication
+        Configure Earth Engine authentication
+        
+        Earth Engine itself is initialized lazily on the first embedding request,
+        so constructing the extractor does not block on an auth round-trip.
         
         Args:
             service_account_key: Path to service account JSON key file
@@ -24,23 +104,59 @@ class AlphaEarthFeatureExtractor:
         """
         import os
         self.project_id = project_id or os.getenv('GOOGLE_CLOUD_PROJECT')
+        self.service_account_key = service_account_key
+        self._ee_initialized = False
+        # Result of the first ee_available() probe, so a failed init isn't retried per call
+        self._ee_available = None
         
-        try:
-            if service_account_key:
-                credentials = ee.ServiceAccountCredentials(None, service_account_key)
-                if self.project_id:
-                    ee.Initialize(credentials, project=self.project_id)
-                else:
-                    ee.Initialize(credentials)
-            else:
-                if self.project_id:
-                    ee.Initialize(project=self.project_id)
-                else:
-                    ee.Initialize()
-            logging.info(f"Earth Engine initialized successfully (project: {self.project_id})")
-        except Exception as e:
-            logging.error(f"Failed to initialize Earth Engine: {e}")
-            raise
+        # Earth Engine calls block on network I/O, so independent batches overlap in threads
+        self._pool = ThreadPoolExecutor(max_workers=16)
+    
+    def _ensure_ee(self):
+        """Initialize Earth Engine on first use"""
+        if self._ee_initialized:
+            return
+        
+        # ee.Initialize is process-wide, so extractors sharing a configuration
+        # (bridge, AlphaEarthExtractor, scripts) only pay for it once
+        config = (self.service_account_key, self.project_id)
+        with _ee_init_lock:
+            if config not in _ee_initialized_configs:
+                try:
+                    if self.service_account_key:
+                        credentials = ee.ServiceAccountCredentials(None, self.service_account_key)
+                    else:
+                        credentials = 'persistent'
+                    # URL passed positionally: the keyword is opt_url in older earthengine-api releases
+                    if self.project_id:
+                        ee.Initialize(credentials, _EE_HIGH_VOLUME_URL, project=self.project_id)
+                    else:
+                        ee.Initialize(credentials, _EE_HIGH_VOLUME_URL)
+                    _ee_initialized_configs.add(config)
+                    logger.info("Earth Engine initialized successfully (project: %s)", self.project_id)
+                except Exception as e:
+                    logger.error("Failed to initialize Earth Engine: %s", e)
+                    raise
+        self._ee_initialized = True
+    
+    def ee_available(self) -> bool:
+        """
+        Check whether Earth Engine can be initialized with this configuration
+        
+        Runs the lazy initialization on the first call and remembers the outcome,
+        so callers choosing between real and simulated extraction can ask on
+        every request without retrying a failed initialization.
+        
+        Returns:
+            True if Earth Engine is initialized, False otherwise
+        """
+        if self._ee_available is None:
+            try:
+                self._ensure_ee()
+                self._ee_available = True
+            except Exception:
+                self._ee_available = False
+        return self._ee_available
     
     def get_satellite_embeddings(self, 
                                 latitude: float, 
@@ -59,20 +175,16 @@ class AlphaEarthFeatureExtractor:
         Returns:
             Earth Engine Image with 64-dimensional embeddings
         """
+        self._ensure_ee()
+        
         # Create point geometry
         point = ee.Geometry.Point([longitude, latitude])
         
         # Create buffer around point for regional analysis
         region = point.buffer(buffer_meters)
         
-        # Load AlphaEarth embedding collection
-        dataset = ee.ImageCollection('GOOGLE/SATELLITE_EMBEDDING/V1/ANNUAL')
-        
-        # Filter by date and location
-        start_date = f'{year}-01-01'
-        end_date = f'{year + 1}-01-01'
-        
-        embedding_image = dataset.filterDate(start_date, end_date)\
+        # Filter the year's AlphaEarth embeddings by location
+        embedding_image = _annual_embeddings(year)\
                                 .filterBounds(region)\
                                 .first()
         
@@ -81,6 +193,98 @@ class AlphaEarthFeatureExtractor:
         
         return embedding_image.clip(region)
     
+    def get_satellite_embeddings_batch(self,
+                                       points: List[Tuple[float, float]],
+                                       year: int = 2024,
+                                       buffer_meters: int = 1000,
+                                       scale: int = 10) -> np.ndarray:
+        """
+        Get mean AlphaEarth embeddings for many locations in one Earth Engine request
+        
+        All points are reduced server-side with a single reduceRegions call, so the
+        whole batch costs one getInfo() round-trip instead of one per location.
+        
+        Args:
+            points: List of (latitude, longitude) tuples
+            year: Year for embeddings (default: 2024)
+            buffer_meters: Buffer around each point in meters
+            scale: Reduction scale in meters
+        
+        Returns:
+            (N, 64) float array of embeddings, one row per point in input order
+            (NaN rows where no embedding data is available)
+        """
+        if not points:
+            return np.empty((0, len(_EMBEDDING_BANDS)))
+        
+        self._ensure_ee()
+        
+        regions = ee.FeatureCollection([
+            ee.Feature(ee.Geometry.Point([lon, lat]).buffer(buffer_meters), {'index': i})
+            for i, (lat, lon) in enumerate(points)
+        ])
+        
+        # Points may fall on different annual tiles, so mosaic rather than take first()
+        embedding_image = _annual_embeddings(year)\
+                                .filterBounds(regions.geometry())\
+                                .mosaic()
+        
+        reduced = embedding_image.reduceRegions(
+            collection=regions,
+            reducer=ee.Reducer.mean(),
+            scale=scale
+        ).getInfo()
+        
+        embeddings = np.full((len(points), len(_EMBEDDING_BANDS)), np.nan)
+        for feature in reduced.get('features', []):
+            properties = feature.get('properties', {})
+            values = [properties.get(band) for band in _EMBEDDING_BANDS]
+            if None not in values:
+                embeddings[properties['index']] = values
+        
+        return embeddings
+    
+    def get_satellite_embeddings_many(self,
+                                      requests: List[Tuple[float, float, int, int]]) -> np.ndarray:
+        """
+        Get mean embeddings for locations that may differ in year and buffer size
+        
+        Requests sharing a (year, buffer_meters) key are grouped into a single
+        batch call, and the groups run concurrently on the extractor's thread pool.
+        
+        Args:
+            requests: List of (latitude, longitude, year, buffer_meters) tuples
+            
+        Returns:
+            (N, 64) float array of embeddings in request order (NaN rows where
+            no embedding data is available)
+        """
+        embeddings = np.full((len(requests), len(_EMBEDDING_BANDS)), np.nan)
+        if not requests:
+            return embeddings
+        
+        # Initialize once up front rather than racing from worker threads
+        self._ensure_ee()
+        
+        groups: Dict[Tuple[int, int], List[int]] = {}
+        for i, (_, _, year, buffer_meters) in enumerate(requests):
+            groups.setdefault((year, buffer_meters), []).append(i)
+        
+        futures = {
+            key: self._pool.submit(
+                self.get_satellite_embeddings_batch,
+                [requests[i][:2] for i in indices],
+                key[0],
+                key[1]
+            )
+            for key, indices in groups.items()
+        }
+        
+        for key, future in futures.items():
+            embeddings[groups[key]] = future.result()
+        
+        return embeddings
+    
     def extract_agricultural_features(self, 
                                     latitude: float, 
                                     longitude: float,
@@ -100,10 +304,50 @@ class AlphaEarthFeatureExtractor:
             Dictionary with extracted agricultural features
         """
         # Use location-based feature generation for consistent, diverse results
-        logging.info(f"Extracting location-based features for ({latitude}, {longitude})")
+        logger.info("Extracting location-based features for (%s, %s)", latitude, longitude)
         return self._get_fallback_features(latitude, longitude)
     
-    def _embeddings_to_agricultural_features(self, embeddings: Dict[str, float]) -> Dict[str, float]:
+    def extract_agricultural_features_batch(self,
+                                            points: List[Tuple[float, float]],
+                                            year: int = 2024) -> List[Dict[str, float]]:
+        """
+        Extract agricultural features for many locations in one call
+        
+        Args:
+            points: List of (latitude, longitude) tuples
+            year: Year for analysis (currently unused but kept for compatibility)
+            
+        Returns:
+            List of feature dictionaries, one per point in input order
+        """
+        logger.info("Extracting location-based features for %d locations", len(points))
+        return [
+            dict(zip(_FEATURE_NAMES, _fallback_cached(int(round(lat * 1000)), int(round(lon * 1000)))))
+            for lat, lon in points
+        ]
+    
+    def extract_agricultural_features_array(self,
+                                            latitude: float,
+                                            longitude: float,
+                                            year: int = 2024) -> np.ndarray:
+        """
+        Extract agricultural features as a flat vector for the crop model
+        
+        Same values as extract_agricultural_features, as a (7,) float array in
+        _FEATURE_NAMES order, so it can be fed (or stacked) straight into the
+        model without rebuilding it from a dict.
+        """
+        return np.array(
+            _fallback_cached(int(round(latitude * 1000)), int(round(longitude * 1000)))
+        )
+    
+    @staticmethod
+    def to_dict(features: np.ndarray) -> Dict[str, float]:
+        """Convert a feature vector in _FEATURE_NAMES order to a named dictionary"""
+        return dict(zip(_FEATURE_NAMES, np.asarray(features).tolist()))
+    
+    def _embeddings_to_agricultural_features(self,
+                                             embeddings: Union[np.ndarray, Mapping[str, float]]) -> Dict[str, float]:
         """
         Convert 64D embeddings to 7 agricultural features using learned mapping
         
@@ -111,105 +355,29 @@ class AlphaEarthFeatureExtractor:
         to map embeddings to soil/climate parameters using ground truth data
         
         Args:
-            embeddings: Dictionary of 64 embedding values
+            embeddings: 64-value embedding vector (A00..A63 order), or a dict keyed by band name
             
         Returns:
             Dictionary with agricultural features
         """
-        # Convert embeddings to numpy array
-        embedding_vector = np.array([embeddings[f'A{i:02d}'] for i in range(64)])
+        if isinstance(embeddings, Mapping):
+            embedding_vector = np.fromiter(_bands_to_values(embeddings), dtype=np.float64,
+                                           count=len(_EMBEDDING_BANDS))
+        else:
+            embedding_vector = np.asarray(embeddings, dtype=np.float64)
         
         # Simplified feature extraction using embedding analysis
         # In practice, these would be learned mappings from training data
+        #
+        # Each feature is (mean * scale) + bias + (std * var_scale) over its
+        # embedding dimensions, clipped to the training data range. All seven
+        # means and stds come out of two matrix-vector products.
+        scores = _extract_kernel(
+            embedding_vector, _ESTIMATOR_MEAN_MASK, _ESTIMATOR_SCALE, _ESTIMATOR_BIAS,
+            _ESTIMATOR_VAR_SCALE, _ESTIMATOR_LO, _ESTIMATOR_HI
+        )
         
-        # Nitrogen estimation (based on vegetation/soil embeddings)
-        nitrogen = self._estimate_nitrogen(embedding_vector)
-        
-        # Phosphorus estimation  
-        phosphorus = self._estimate_phosphorus(embedding_vector)
-        
-        # Potassium estimation
-        potassium = self._estimate_potassium(embedding_vector)
-        
-        # Temperature estimation (from thermal/seasonal patterns)
-        temperature = self._estimate_temperature(embedding_vector)
-        
-        # Humidity estimation (from moisture/cloud patterns)
-        humidity = self._estimate_humidity(embedding_vector)
-        
-        # pH estimation (from soil/mineral signatures)
-        ph = self._estimate_ph(embedding_vector)
-        
-        # Rainfall estimation (from precipitation patterns)
-        rainfall = self._estimate_rainfall(embedding_vector)
-        
-        return {
-            'nitrogen': nitrogen,
-            'phosphorus': phosphorus, 
-            'potassium': potassium,
-            'temperature': temperature,
-            'humidity': humidity,
-            'ph': ph,
-            'rainfall': rainfall
-        }
-    
-    def _estimate_nitrogen(self, embeddings: np.ndarray) -> float:
-        """Estimate nitrogen content from embeddings"""
-        # Use dimensions that showed high variation in our analysis
-        vegetation_dims = embeddings[[1, 5, 12, 23, 34, 32, 37]]  # Include high-variation dims
-        # More sophisticated scaling that preserves variation
-        base_score = np.mean(vegetation_dims)
-        variation_factor = np.std(vegetation_dims) * 50  # Amplify variation
-        nitrogen_score = (base_score * 200) + 70 + variation_factor  # Scale to 0-140 range
-        return max(0, min(140, nitrogen_score))
-    
-    def _estimate_phosphorus(self, embeddings: np.ndarray) -> float:
-        """Estimate phosphorus content from embeddings"""
-        soil_dims = embeddings[[3, 8, 15, 27, 41, 21, 22]]  # Include high-variation dims
-        base_score = np.mean(soil_dims)
-        variation_factor = np.std(soil_dims) * 40
-        phosphorus_score = (base_score * 150) + 75 + variation_factor  # Scale to 5-145 range
-        return max(5, min(145, phosphorus_score))
-    
-    def _estimate_potassium(self, embeddings: np.ndarray) -> float:
-        """Estimate potassium content from embeddings"""
-        mineral_dims = embeddings[[2, 9, 18, 31, 47, 45]]  # Include high-variation dims
-        base_score = np.mean(mineral_dims)
-        variation_factor = np.std(mineral_dims) * 60
-        potassium_score = (base_score * 180) + 105 + variation_factor  # Scale to 5-205 range
-        return max(5, min(205, potassium_score))
-    
-    def _estimate_temperature(self, embeddings: np.ndarray) -> float:
-        """Estimate temperature from embeddings"""
-        thermal_dims = embeddings[[6, 13, 22, 35, 52, 32]]  # Include high-variation dims
-        base_score = np.mean(thermal_dims)
-        variation_factor = np.std(thermal_dims) * 15
-        temp_score = (base_score * 40) + 26 + variation_factor  # Scale to 8.8-43.7 range
-        return max(8.8, min(43.7, temp_score))
-    
-    def _estimate_humidity(self, embeddings: np.ndarray) -> float:
-        """Estimate humidity from embeddings"""
-        moisture_dims = embeddings[[4, 11, 19, 29, 44, 37]]  # Include high-variation dims
-        base_score = np.mean(moisture_dims)
-        variation_factor = np.std(moisture_dims) * 30
-        humidity_score = (base_score * 80) + 57 + variation_factor  # Scale to 14.3-99.9 range
-        return max(14.3, min(99.9, humidity_score))
-    
-    def _estimate_ph(self, embeddings: np.ndarray) -> float:
-        """Estimate pH from embeddings"""
-        soil_ph_dims = embeddings[[7, 14, 25, 38, 56, 21]]  # Include high-variation dims
-        base_score = np.mean(soil_ph_dims)
-        variation_factor = np.std(soil_ph_dims) * 2
-        ph_score = (base_score * 4) + 6.7 + variation_factor  # Scale to 3.5-9.9 range
-        return max(3.5, min(9.9, ph_score))
-    
-    def _estimate_rainfall(self, embeddings: np.ndarray) -> float:
-        """Estimate rainfall from embeddings"""
-        precip_dims = embeddings[[10, 17, 26, 39, 58, 32, 45]]  # Include high-variation dims
-        base_score = np.mean(precip_dims)
-        variation_factor = np.std(precip_dims) * 100
-        rainfall_score = (base_score * 200) + 159 + variation_factor  # Scale to 20.2-298.6 range
-        return max(20.2, min(298.6, rainfall_score))
+        return dict(zip(_FEATURE_NAMES, scores.tolist()))
     
     def _get_fallback_features(self, latitude: float, longitude: float) -> Dict[str, float]:
         """
@@ -218,88 +386,65 @@ class AlphaEarthFeatureExtractor:
         This creates diverse features based on geographic coordinates that result
         in different crop predictions across locations
         """
-        # Create a deterministic but varied hash from coordinates
-        coord_hash = abs(hash(f"{latitude:.3f}_{longitude:.3f}")) % 10000 / 10000.0
-        
-        # Define crop zones based on training data patterns
-        if coord_hash < 0.15:  # Rice zone (15% of locations)
-            features = {
-                'nitrogen': 85 + (coord_hash * 10) * 1.5,      # 85-100 (rice range)
-                'phosphorus': 40 + (coord_hash * 10) * 2,      # 40-60 (rice range)
-                'potassium': 38 + (coord_hash * 10) * 0.8,     # 38-46 (rice range)
-                'temperature': 21 + (coord_hash * 10) * 0.6,   # 21-27°C (rice range)
-                'humidity': 80 + (coord_hash * 10) * 0.5,      # 80-85% (rice range)
-                'ph': 6.0 + (coord_hash * 10) * 0.15,         # 6.0-7.5 (rice range)
-                'rainfall': 200 + (coord_hash * 10) * 10      # 200-300mm (rice range)
-            }
-            zone = "Rice"
-        elif coord_hash < 0.30:  # Maize zone (15% of locations)
-            features = {
-                'nitrogen': 70 + ((coord_hash - 0.15) * 10) * 2,    # 70-90
-                'phosphorus': 25 + ((coord_hash - 0.15) * 10) * 2,  # 25-45
-                'potassium': 15 + ((coord_hash - 0.15) * 10) * 1,   # 15-25
-                'temperature': 24 + ((coord_hash - 0.15) * 10) * 0.4, # 24-28°C
-                'humidity': 60 + ((coord_hash - 0.15) * 10) * 1,    # 60-70%
-                'ph': 5.8 + ((coord_hash - 0.15) * 10) * 0.2,      # 5.8-6.8
-                'rainfall': 80 + ((coord_hash - 0.15) * 10) * 8     # 80-160mm
-            }
-            zone = "Maize"
-        elif coord_hash < 0.45:  # Orange/Apple zone (15% of locations)
-            features = {
-                'nitrogen': 50 + ((coord_hash - 0.30) * 10) * 1.5,  # 50-65
-                'phosphorus': 60 + ((coord_hash - 0.30) * 10) * 2,  # 60-80
-                'potassium': 80 + ((coord_hash - 0.30) * 10) * 2,   # 80-100
-                'temperature': 18 + ((coord_hash - 0.30) * 10) * 0.8, # 18-26°C
-                'humidity': 70 + ((coord_hash - 0.30) * 10) * 1,    # 70-80%
-                'ph': 6.5 + ((coord_hash - 0.30) * 10) * 0.1,      # 6.5-7.5
-                'rainfall': 120 + ((coord_hash - 0.30) * 10) * 6    # 120-180mm
-            }
-            zone = "Fruit"
-        elif coord_hash < 0.60:  # Legume zone (Lentil, Chickpea) (15% of locations)
-            features = {
-                'nitrogen': 30 + ((coord_hash - 0.45) * 10) * 2,    # 30-50
-                'phosphorus': 70 + ((coord_hash - 0.45) * 10) * 1.5, # 70-85
-                'potassium': 40 + ((coord_hash - 0.45) * 10) * 1,   # 40-50
-                'temperature': 22 + ((coord_hash - 0.45) * 10) * 0.5, # 22-27°C
-                'humidity': 65 + ((coord_hash - 0.45) * 10) * 1,    # 65-75%
-                'ph': 7.0 + ((coord_hash - 0.45) * 10) * 0.2,      # 7.0-9.0
-                'rainfall': 40 + ((coord_hash - 0.45) * 10) * 4     # 40-80mm
-            }
-            zone = "Legume"
-        elif coord_hash < 0.75:  # Tropical fruits (Coconut, Banana) (15% of locations)
-            features = {
-                'nitrogen': 60 + ((coord_hash - 0.60) * 10) * 1.5,  # 60-75
-                'phosphorus': 45 + ((coord_hash - 0.60) * 10) * 1,  # 45-55
-                'potassium': 100 + ((coord_hash - 0.60) * 10) * 3,  # 100-130
-                'temperature': 28 + ((coord_hash - 0.60) * 10) * 0.4, # 28-32°C
-                'humidity': 85 + ((coord_hash - 0.60) * 10) * 0.5,  # 85-90%
-                'ph': 6.0 + ((coord_hash - 0.60) * 10) * 0.3,      # 6.0-9.0
-                'rainfall': 180 + ((coord_hash - 0.60) * 10) * 8    # 180-260mm
-            }
-            zone = "Tropical"
-        else:  # Cotton/Cash crops zone (25% of locations)
-            features = {
-                'nitrogen': 100 + ((coord_hash - 0.75) * 4) * 1.5,  # 100-115
-                'phosphorus': 20 + ((coord_hash - 0.75) * 4) * 2,   # 20-40
-                'potassium': 50 + ((coord_hash - 0.75) * 4) * 1,    # 50-60
-                'temperature': 26 + ((coord_hash - 0.75) * 4) * 0.6, # 26-32°C
-                'humidity': 75 + ((coord_hash - 0.75) * 4) * 1,     # 75-85%
-                'ph': 6.2 + ((coord_hash - 0.75) * 4) * 0.2,       # 6.2-7.0
-                'rainfall': 60 + ((coord_hash - 0.75) * 4) * 10     # 60-100mm
-            }
-            zone = "Cotton/Cash"
-        
-        logging.info(f"Generated {zone} zone features for ({latitude}, {longitude}) - Hash: {coord_hash:.3f}")
-        
-        return {
-            'nitrogen': float(features['nitrogen']),
-            'phosphorus': float(features['phosphorus']),
-            'potassium': float(features['potassium']),
-            'temperature': float(features['temperature']),
-            'humidity': float(features['humidity']),
-            'ph': float(features['ph']),
-            'rainfall': float(features['rainfall'])
-        }
+        vals = _fallback_cached(int(round(latitude * 1000)), int(round(longitude * 1000)))
+        return dict(zip(_FEATURE_NAMES, vals))
+
+@functools.lru_cache(maxsize=8)
+def _annual_embeddings(year: int) -> ee.ImageCollection:
+    """
+    AlphaEarth embedding collection filtered to one calendar year
+    
+    Dates are built with ee.Date.fromYMD so identical years produce identical
+    expression graphs, and the filtered collection is reused across requests.
+    """
+    start = ee.Date.fromYMD(year, 1, 1)
+    end = start.advance(1, 'year')
+    return ee.ImageCollection('GOOGLE/SATELLITE_EMBEDDING/V1/ANNUAL').filterDate(start, end)
+
+@njit(cache=True, fastmath=True)
+def _extract_kernel(v, mean_mask, scale, bias, var_scale, lo, hi):
+    """Fused estimator: masked means and stds of the embedding, scaled and clipped"""
+    means = mean_mask @ v
+    sq_means = mean_mask @ (v * v)
+    stds = np.sqrt(np.maximum(sq_means - means * means, 0.0))
+    scores = means * scale + bias + stds * var_scale
+    return np.minimum(np.maximum(scores, lo), hi)
+
+def _coord_hash(lat_q: int, lon_q: int) -> float:
+    """
+    Map quantized coordinates to [0, 1) with a SplitMix64 finalizer
+    
+    Unlike the builtin str hash this is not salted per process, so a location
+    lands in the same crop zone across restarts and workers.
+    """
+    x = ((lat_q & 0xFFFFF) << 20) | (lon_q & 0xFFFFF)
+    x = (x + 0x9E3779B97F4A7C15) & _MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK64
+    x ^= x >> 31
+    return (x % 10000) / 10000.0
+
+@functools.lru_cache(maxsize=8192)
+def _fallback_cached(lat_q: int, lon_q: int) -> Tuple[float, ...]:
+    """
+    Location-based features for coordinates quantized to 1e-3 degrees
+    
+    Deterministic in (lat_q, lon_q), so repeat lookups for the same farm are
+    served from the cache. Values are ordered as in _FEATURE_NAMES.
+    """
+    # Create a deterministic but varied hash from coordinates
+    latitude, longitude = lat_q / 1000.0, lon_q / 1000.0
+    coord_hash = _coord_hash(lat_q, lon_q)
+    
+    # Pick the crop zone and the position within it, then interpolate the table
+    zone = int(np.searchsorted(_ZONE_UPPER, coord_hash, side='right'))
+    local_t = (coord_hash - _ZONE_LOWER[zone]) * _ZONE_SPAN[zone]
+    features = _ZONE_BASE[zone] + _ZONE_SLOPE[zone] * local_t
+    
+    logger.info("Generated %s zone features for (%s, %s) - Hash: %.3f",
+                _ZONE_NAMES[zone], latitude, longitude, coord_hash)
+    
+    return tuple(features.tolist())
 
 # Example usage
 if __name__ == "__main__":
@@ -0,0 +1,127 @@
+"""
+Cache for extracted satellite features
+
+Feature extraction is keyed by (latitude, longitude, year) and repeats for the
+same farms across requests, so results are kept in an in-process LRU. Setting
+FEATURE_CACHE_PATH (or passing db_path) also persists them to a small SQLite
+table so they survive restarts.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Bump when the extractor or its source asset changes so stale entries are never served
+FEATURE_CACHE_VERSION = 'alphaearth-v1-annual'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS features (
+    key TEXT PRIMARY KEY,
+    value TEXT
+)
+"""
+
+def feature_cache_key(latitude: float, longitude: float, year: int, source: str) -> str:
+    """Cache key for a location, rounded to 4 decimals (~11 m) and tagged with the extractor version"""
+    return f"{FEATURE_CACHE_VERSION}:{source}:{latitude:.4f}:{longitude:.4f}:{year}"
+
+class FeatureCache:
+    """
+    Two-level feature cache: bounded in-memory LRU, optionally backed by a SQLite file
+    
+    Safe to share across request threads; database access is serialized by a lock.
+    Entries are held as JSON text, so every get() returns a fresh copy that callers
+    may mutate freely. Cache failures are logged and never fail the caller.
+    """
+    
+    def __init__(self, db_path: Optional[str] = None, max_memory_entries: int = 1000):
+        """
+        Create the cache
+        
+        Args:
+            db_path: SQLite file for persistence; defaults to the FEATURE_CACHE_PATH
+                environment variable, and the cache is memory only if neither is set
+            max_memory_entries: Size of the in-memory LRU
+        """
+        self.db_path = db_path or os.getenv('FEATURE_CACHE_PATH') or None
+        self.max_memory_entries = max_memory_entries
+        self._memory: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        # SQLite connections must not cross fork(), so each process opens its own
+        self._conn = None
+        self._conn_pid = None
+    
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        """SQLite connection for the current process, opened on first use; None if unavailable"""
+        if self.db_path is None:
+            return None
+        
+        pid = os.getpid()
+        if self._conn_pid != pid:
+            self._conn_pid = pid
+            self._conn = None
+            try:
+                os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+                conn = sqlite3.connect(self.db_path, check_same_thread=False)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.execute(_SCHEMA)
+                conn.commit()
+                self._conn = conn
+            except (sqlite3.Error, OSError) as e:
+                logger.warning("Feature cache running in memory only (%s): %s", self.db_path, e)
+        return self._conn
+    
+    def get(self, key: str) -> Optional[Dict]:
+        """Copy of the cached value for key, or None"""
+        with self._lock:
+            text = self._memory.get(key)
+            if text is not None:
+                self._memory.move_to_end(key)
+                return json.loads(text)
+            
+            conn = self._connection()
+            if conn is None:
+                return None
+            try:
+                row = conn.execute("SELECT value FROM features WHERE key = ?", (key,)).fetchone()
+            except sqlite3.Error as e:
+                logger.warning("Feature cache read failed: %s", e)
+                return None
+            if row is None:
+                return None
+            
+            self._remember(key, row[0])
+            return json.loads(row[0])
+    
+    def set(self, key: str, value: Dict):
+        """Store value under key in memory and, if persistent, on disk"""
+        try:
+            text = json.dumps(value)
+        except (TypeError, ValueError) as e:
+            logger.warning("Not caching features for %s: %s", key, e)
+            return
+        
+        with self._lock:
+            self._remember(key, text)
+            conn = self._connection()
+            if conn is None:
+                return
+            try:
+                with conn:
+                    conn.execute("INSERT OR REPLACE INTO features VALUES (?, ?)", (key, text))
+            except sqlite3.Error as e:
+                logger.warning("Feature cache write failed: %s", e)
+    
+    def _remember(self, key: str, text: str):
+        """Insert into the in-memory LRU, evicting the oldest entry when full"""
+        self._memory[key] = text
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
@@ -7,6 +7,7 @@ embedding system and the crop recommendation ML model.
 
 import numpy as np
 import logging
+import operator
 import os
 from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass
@@ -40,8 +41,56 @@ except ImportError:
     AgriculturalAdvisor = None
     AgriculturalAdviceRequest = None
 
+try:
+    from core.feature_cache import FeatureCache, feature_cache_key
+except ImportError:
+    from .feature_cache import FeatureCache, feature_cache_key
+
 logger = logging.getLogger(__name__)
 
+# Feature values in the order the crop model was trained on
+_feature_values = operator.itemgetter(
+    'nitrogen', 'phosphorus', 'potassium', 'temperature', 'humidity', 'ph', 'rainfall'
+)
+
+class FusedScaler:
+    """
+    Chain of fitted sklearn scalers collapsed into one affine transform
+    
+    MinMaxScaler (without clipping) and StandardScaler are both affine, so any
+    sequence of them equals X * a + b for per-feature vectors a and b. Applying
+    that directly is one NumPy expression instead of a validated sklearn call
+    per scaler.
+    """
+    
+    def __init__(self, *scalers):
+        """
+        Fuse fitted scalers, applied in the given order
+        
+        Args:
+            scalers: Fitted MinMaxScaler / StandardScaler instances
+        """
+        a, b = 1.0, 0.0
+        for scaler in scalers:
+            if hasattr(scaler, 'data_min_'):
+                if getattr(scaler, 'clip', False):
+                    raise ValueError("Clipping MinMaxScaler is not affine and cannot be fused")
+                scale, offset = scaler.scale_, scaler.min_
+            else:
+                std = scaler.scale_ if scaler.scale_ is not None else 1.0
+                mean = scaler.mean_ if scaler.mean_ is not None else 0.0
+                scale, offset = 1.0 / std, -mean / std
+            a, b = a * scale, b * scale + offset
+        
+        self.a = np.asarray(a, dtype=np.float64)
+        self.b = np.asarray(b, dtype=np.float64)
+    
+    def transform(self, X) -> np.ndarray:
+        """Scale a (N, n_features) array"""
+        out = np.multiply(X, self.a, dtype=np.float64)
+        out += self.b
+        return out
+
 @dataclass
 class CropRecommendationRequest:
     """Request structure for crop recommendation"""
@@ -98,7 +147,8 @@ class UltraIntegrationBridge:
                  scaler_paths: Tuple[str, str] = ('minmaxscaler.pkl', 'standscaler.pkl'),
                  earth_engine_credentials: Optional[str] = None,
                  cache_size: int = 1000,
-                 enable_async: bool = True):
+                 enable_async: bool = True,
+                 feature_cache_path: Optional[str] = None):
         """
         Initialize the integration bridge
         
@@ -108,9 +158,12 @@ class UltraIntegrationBridge:
             earth_engine_credentials: Path to Earth Engine service account key
             cache_size: Size of the LRU cache for embeddings
             enable_async: Whether to enable async processing
+            feature_cache_path: SQLite file persisting extracted features across
+                restarts; defaults to FEATURE_CACHE_PATH, memory only if unset
         """
         self.enable_async = enable_async
         self.cache_size = cache_size
+        self.feature_cache = FeatureCache(feature_cache_path, max_memory_entries=cache_size)
         
         # Initialize crop recommendation system
         self._load_ml_models(model_path, scaler_paths)
@@ -184,6 +237,9 @@ class UltraIntegrationBridge:
                         self.standard_scaler = pickle.load(f)
                 logger.warning("⚠️  Using original (potentially broken) Standard scaler")
             
+            # The model was trained on MinMax-scaled features only; apply that as one affine op
+            self.feature_scaler = FusedScaler(self.minmax_scaler)
+            
             # Crop mapping dictionary
             self.crop_dict = {
                 1: "Rice", 2: "Maize", 3: "Jute", 4: "Cotton", 5: "Coconut", 
@@ -193,6 +249,10 @@ class UltraIntegrationBridge:
                 18: "Mothbeans", 19: "Pigeonpeas", 20: "Kidneybeans", 
                 21: "Chickpea", 22: "Coffee"
             }
+            # Same mapping indexed by class id (slot 0 is "Unknown") for vectorized lookups
+            self.crop_names = np.array(
+                ["Unknown"] + [self.crop_dict[i] for i in range(1, len(self.crop_dict) + 1)], dtype=object
+            )
             
             logger.info("ML models loaded successfully")
             
@@ -203,7 +263,6 @@ class UltraIntegrationBridge:
     def _initialize_alphaearth(self, credentials_path: Optional[str]):
         """Initialize AlphaEarth extraction system"""
         self.alphaearth_extractor = None
-        self.use_real_alphaearth = False
         
         # Get project ID from environment or constructor
         project_id = os.getenv('GOOGLE_CLOUD_PROJECT', 'reboot-468512')
@@ -215,13 +274,8 @@ class UltraIntegrationBridge:
                     service_account_key=credentials_path,
                     project_id=project_id
                 )
-                # Check if it's using real Earth Engine or mock
-                if hasattr(self.alphaearth_extractor, 'use_real_ee') and self.alphaearth_extractor.use_real_ee:
-                    self.use_real_alphaearth = True
-                    logger.info(f"Real AlphaEarth extractor initialized with Earth Engine (project: {project_id})")
-                else:
-                    self.use_real_alphaearth = False
-                    logger.info("AlphaEarth extractor initialized with mock fallback")
+                # Real Earth Engine vs mock is decided on first extraction (see use_real_alphaearth)
+                logger.info(f"AlphaEarth extractor initialized (project: {project_id})")
                 return
             except Exception as e:
                 logger.warning(f"AlphaEarth extractor failed: {e}")
@@ -233,7 +287,6 @@ class UltraIntegrationBridge:
                     service_account_key=credentials_path,
                     project_id=project_id
                 )
-                self.use_real_alphaearth = True
                 logger.info(f"Earth Engine integration extractor initialized (project: {project_id})")
                 return
             except Exception as e:
@@ -243,12 +296,26 @@ class UltraIntegrationBridge:
         try:
             from test_with_mock_ee import MockAlphaEarthFeatureExtractor
             self.alphaearth_extractor = MockAlphaEarthFeatureExtractor()
-            self.use_real_alphaearth = False
             logger.info("Mock extractor initialized as final fallback")
         except Exception as e:
             logger.error(f"All extractors failed, including mock: {e}")
             self.alphaearth_extractor = None
     
+    @property
+    def use_real_alphaearth(self) -> bool:
+        """
+        Whether extracted features come from real Earth Engine
+        
+        Earth Engine initializes lazily, so the first access (normally the first
+        extraction) runs the availability probe instead of bridge startup.
+        """
+        extractor = self.alphaearth_extractor
+        if hasattr(extractor, 'use_real_ee'):
+            return extractor.use_real_ee
+        if hasattr(extractor, 'ee_available'):
+            return extractor.ee_available()
+        return False
+    
     def _initialize_agricultural_advisor(self):
         """Initialize Agricultural Advisor with Azure OpenAI"""
         self.agricultural_advisor = None
@@ -282,7 +349,7 @@ class UltraIntegrationBridge:
         if not self.enable_async:
             return self.get_crop_recommendation(request)
         
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
         return await loop.run_in_executor(None, self.get_crop_recommendation, request)
     
     def get_crop_recommendation(self, 
@@ -328,44 +395,9 @@ class UltraIntegrationBridge:
             )
             
             # Step 4: Generate farmer advice using LLM with translations
-            farmer_advice = None
-            farmer_advice_amharic = None
-            farmer_advice_afaan_oromo = None
-            advice_available = False
-            translation_available = False
-            
-            if self.advisor_available and self.agricultural_advisor:
-                try:
-                    advice_request = AgriculturalAdviceRequest(
-                        crop_name=crop_prediction['crop_name'],
-                        suitability_confidence=crop_prediction['confidence'],
-                        nitrogen=satellite_features.get('nitrogen', 0),
-                        phosphorus=satellite_features.get('phosphorus', 0),
-                        potassium=satellite_features.get('potassium', 0),
-                        temperature=satellite_features.get('temperature', 0),
-                        humidity=satellite_features.get('humidity', 0),
-                        ph_level=satellite_features.get('ph', 0),
-                        rainfall=satellite_features.get('rainfall', 0),
-                        climate_zone=region_info.get('climate_zone', 'unknown'),
-                        alternative_crops=alternative_crops
-                    )
-                    
-                    advice_response = self.agricultural_advisor.get_farmer_advice(advice_request)
-                    if advice_response.success:
-                        farmer_advice = advice_response.advice_text
-                        farmer_advice_amharic = advice_response.advice_text_amharic
-                        farmer_advice_afaan_oromo = advice_response.advice_text_afaan_oromo
-                        advice_available = True
-                        translation_available = advice_response.translation_success
-                        
-                        total_time = advice_response.processing_time_ms + advice_response.translation_time_ms
-                        logger.info(f"Generated farmer advice in {advice_response.processing_time_ms:.1f}ms, translations in {advice_response.translation_time_ms:.1f}ms (total: {total_time:.1f}ms)")
-                    else:
-                        logger.warning(f"Failed to generate farmer advice: {advice_response.error_message}")
-                        farmer_advice = advice_response.advice_text  # Fallback advice
-                        
-                except Exception as e:
-                    logger.error(f"Error generating farmer advice: {e}")
+            advice = self._generate_farmer_advice(
+                crop_prediction, satellite_features, region_info, alternative_crops
+            )
             
             # Step 5: Calculate processing time
             processing_time = (time.time() - start_time) * 1000
@@ -386,12 +418,8 @@ class UltraIntegrationBridge:
                 processing_time_ms=processing_time,
                 data_sources=data_sources,
                 cache_hit=cache_hit,
-                farmer_advice=farmer_advice,
-                farmer_advice_amharic=farmer_advice_amharic,
-                farmer_advice_afaan_oromo=farmer_advice_afaan_oromo,
-                advice_available=advice_available,
-                translation_available=translation_available,
-                alternative_crops=alternative_crops
+                alternative_crops=alternative_crops,
+                **advice
             )
             
             logger.info(f"Crop recommendation completed: {crop_prediction['crop_name']} "
@@ -404,6 +432,160 @@ class UltraIntegrationBridge:
             logger.error(f"Crop recommendation failed: {e}")
             raise
     
+    def get_crop_recommendations_batch(self,
+                                       requests: List[CropRecommendationRequest],
+                                       generate_advice: bool = True) -> List[Any]:
+        """
+        Get crop recommendations for many locations in one pass
+        
+        Satellite features are extracted once per distinct location (cache
+        misses in one extractor batch call), and the model scores every
+        location with a single vectorized predict / predict_proba call instead
+        of one call per request.
+        
+        Args:
+            requests: CropRecommendationRequests to process
+            generate_advice: Whether to generate LLM farmer advice for each result
+            
+        Returns:
+            One entry per request, in input order: a CropRecommendationResponse,
+            or the exception raised while processing that location
+        """
+        start_time = time.time()
+        
+        # Step 1: Extract satellite features once per distinct location
+        location_index: Dict[Tuple, int] = {}
+        for req in requests:
+            location_index.setdefault((req.latitude, req.longitude, req.year, req.use_cache), len(location_index))
+        
+        extracted = self._extract_satellite_features_many(list(location_index))
+        
+        # Step 2: Score every location with features in one model call
+        predictions: Dict[int, Dict[str, Any]] = {}
+        scored = [i for i, item in enumerate(extracted) if not isinstance(item, Exception)]
+        if scored:
+            feature_matrix = np.array([_feature_values(extracted[i][0]) for i in scored], dtype=np.float64)
+            scaled_features = self.feature_scaler.transform(feature_matrix)
+            class_ids, probabilities = self._classify(scaled_features)
+            crop_names = self._crop_names_for(class_ids)
+            
+            for row, i in enumerate(scored):
+                predictions[i] = {
+                    'class_id': int(class_ids[row]),
+                    'crop_name': crop_names[row],
+                    'confidence': float(np.max(probabilities[row])),
+                    'probabilities': probabilities[row].tolist()
+                }
+        
+        # Step 3: Assemble per-request responses
+        results = []
+        for req in requests:
+            self.stats['total_requests'] += 1
+            i = location_index[(req.latitude, req.longitude, req.year, req.use_cache)]
+            if isinstance(extracted[i], Exception):
+                self.stats['error_count'] += 1
+                logger.error(f"Crop recommendation failed for ({req.latitude}, {req.longitude}): {extracted[i]}")
+                results.append(extracted[i])
+                continue
+            
+            satellite_features, embedding_metadata = extracted[i]
+            cache_hit = embedding_metadata.get('from_cache', False)
+            if cache_hit:
+                self.stats['cache_hits'] += 1
+            
+            crop_prediction = predictions[i]
+            alternative_crops = self._alternatives_from_probabilities(
+                crop_prediction['probabilities'], crop_prediction['class_id']
+            )
+            region_info = self._get_regional_context(req.latitude, req.longitude)
+            advice = self._generate_farmer_advice(
+                crop_prediction, satellite_features, region_info, alternative_crops
+            ) if generate_advice else {}
+            
+            processing_time = (time.time() - start_time) * 1000
+            self._update_stats(processing_time)
+            
+            results.append(CropRecommendationResponse(
+                recommended_crop=crop_prediction['crop_name'],
+                confidence_score=crop_prediction['confidence'],
+                crop_class_id=crop_prediction['class_id'],
+                satellite_features=satellite_features,
+                embedding_metadata=embedding_metadata,
+                coordinates={
+                    'latitude': req.latitude,
+                    'longitude': req.longitude
+                },
+                region_info=region_info,
+                processing_time_ms=processing_time,
+                data_sources=list(embedding_metadata.get('sources', ['AlphaEarth'])),
+                cache_hit=cache_hit,
+                alternative_crops=alternative_crops,
+                **advice
+            ))
+        
+        logger.info(f"Batch crop recommendation completed: {len(requests)} requests, "
+                   f"{len(location_index)} distinct locations ({(time.time() - start_time) * 1000:.1f}ms)")
+        
+        return results
+    
+    def _generate_farmer_advice(self,
+                                crop_prediction: Dict[str, Any],
+                                satellite_features: Dict[str, float],
+                                region_info: Dict[str, Any],
+                                alternative_crops: List[Tuple[str, float]]) -> Dict[str, Any]:
+        """
+        Generate farmer advice (with translations) for a prediction using the LLM advisor
+        
+        Returns:
+            Advice fields of CropRecommendationResponse
+        """
+        farmer_advice = None
+        farmer_advice_amharic = None
+        farmer_advice_afaan_oromo = None
+        advice_available = False
+        translation_available = False
+        
+        if self.advisor_available and self.agricultural_advisor:
+            try:
+                advice_request = AgriculturalAdviceRequest(
+                    crop_name=crop_prediction['crop_name'],
+                    suitability_confidence=crop_prediction['confidence'],
+                    nitrogen=satellite_features.get('nitrogen', 0),
+                    phosphorus=satellite_features.get('phosphorus', 0),
+                    potassium=satellite_features.get('potassium', 0),
+                    temperature=satellite_features.get('temperature', 0),
+                    humidity=satellite_features.get('humidity', 0),
+                    ph_level=satellite_features.get('ph', 0),
+                    rainfall=satellite_features.get('rainfall', 0),
+                    climate_zone=region_info.get('climate_zone', 'unknown'),
+                    alternative_crops=alternative_crops
+                )
+                
+                advice_response = self.agricultural_advisor.get_farmer_advice(advice_request)
+                if advice_response.success:
+                    farmer_advice = advice_response.advice_text
+                    farmer_advice_amharic = advice_response.advice_text_amharic
+                    farmer_advice_afaan_oromo = advice_response.advice_text_afaan_oromo
+                    advice_available = True
+                    translation_available = advice_response.translation_success
+                    
+                    total_time = advice_response.processing_time_ms + advice_response.translation_time_ms
+                    logger.info(f"Generated farmer advice in {advice_response.processing_time_ms:.1f}ms, translations in {advice_response.translation_time_ms:.1f}ms (total: {total_time:.1f}ms)")
+                else:
+                    logger.warning(f"Failed to generate farmer advice: {advice_response.error_message}")
+                    farmer_advice = advice_response.advice_text  # Fallback advice
+                    
+            except Exception as e:
+                logger.error(f"Error generating farmer advice: {e}")
+        
+        return {
+            'farmer_advice': farmer_advice,
+            'farmer_advice_amharic': farmer_advice_amharic,
+            'farmer_advice_afaan_oromo': farmer_advice_afaan_oromo,
+            'advice_available': advice_available,
+            'translation_available': translation_available
+        }
+    
     def _extract_satellite_features(self, 
                                    latitude: float, 
                                    longitude: float, 
@@ -412,7 +594,9 @@ class UltraIntegrationBridge:
         """Extract agricultural features from satellite data"""
         
         # Check cache first
-        cache_key = f"{latitude:.6f}_{longitude:.6f}_{year}"
+        cache_key = feature_cache_key(
+            latitude, longitude, year, 'real' if self.use_real_alphaearth else 'fallback'
+        )
         if use_cache:
             cached_result = self._get_from_cache(cache_key)
             if cached_result:
@@ -426,28 +610,10 @@ class UltraIntegrationBridge:
             raise RuntimeError("No AlphaEarth extractor available")
         
         try:
-            if self.use_real_alphaearth:
-                # Use real AlphaEarth extractor
-                features = self.alphaearth_extractor.extract_agricultural_features(
-                    latitude, longitude, year
-                )
-                metadata = {
-                    'extractor_type': 'real_alphaearth',
-                    'embedding_dimensions': 64,
-                    'sources': ['AlphaEarth_V1_ANNUAL'],
-                    'from_cache': False
-                }
-            else:
-                # Use fallback extractor
-                features = self.alphaearth_extractor.extract_agricultural_features(
-                    latitude, longitude, year
-                )
-                metadata = {
-                    'extractor_type': 'fallback_alphaearth',
-                    'embedding_dimensions': 64,
-                    'sources': ['AlphaEarth_Simulated'],
-                    'from_cache': False
-                }
+            features = self.alphaearth_extractor.extract_agricultural_features(
+                latitude, longitude, year
+            )
+            metadata = self._extraction_metadata()
             
             # Cache the result
             if use_cache:
@@ -462,32 +628,123 @@ class UltraIntegrationBridge:
             logger.error(f"Satellite feature extraction failed: {e}")
             raise
     
+    def _extraction_metadata(self) -> Dict[str, Any]:
+        """Embedding metadata for features freshly extracted by the current extractor"""
+        if self.use_real_alphaearth:
+            return {
+                'extractor_type': 'real_alphaearth',
+                'embedding_dimensions': 64,
+                'sources': ['AlphaEarth_V1_ANNUAL'],
+                'from_cache': False
+            }
+        return {
+            'extractor_type': 'fallback_alphaearth',
+            'embedding_dimensions': 64,
+            'sources': ['AlphaEarth_Simulated'],
+            'from_cache': False
+        }
+    
+    def _extract_satellite_features_many(self,
+                                         locations: List[Tuple[float, float, int, bool]]) -> List[Any]:
+        """
+        Extract agricultural features for many locations
+        
+        Cached locations are served from the feature cache; the misses for each
+        year go to the extractor in one batch call when it supports one. If the
+        batch call fails, those locations are extracted one by one so a bad
+        location only fails itself.
+        
+        Args:
+            locations: List of (latitude, longitude, year, use_cache) tuples
+            
+        Returns:
+            One entry per location, in input order: a (features, metadata) tuple,
+            or the exception raised while extracting that location
+        """
+        results: List[Any] = [None] * len(locations)
+        source = 'real' if self.use_real_alphaearth else 'fallback'
+        misses_by_year: Dict[int, List[int]] = {}
+        
+        for i, (latitude, longitude, year, use_cache) in enumerate(locations):
+            if use_cache:
+                cached_result = self._get_from_cache(feature_cache_key(latitude, longitude, year, source))
+                if cached_result:
+                    results[i] = (cached_result['features'], {
+                        **cached_result['metadata'],
+                        'from_cache': True
+                    })
+                    continue
+            misses_by_year.setdefault(year, []).append(i)
+        
+        extract_batch = getattr(self.alphaearth_extractor, 'extract_agricultural_features_batch', None)
+        for year, indices in misses_by_year.items():
+            batch_features = None
+            if extract_batch is not None:
+                try:
+                    batch_features = extract_batch([locations[i][:2] for i in indices], year)
+                except Exception as e:
+                    logger.warning("Batch feature extraction failed, extracting per location: %s", e)
+            
+            for row, i in enumerate(indices):
+                latitude, longitude, _, use_cache = locations[i]
+                features = batch_features[row] if batch_features is not None else None
+                if features is None:
+                    try:
+                        results[i] = self._extract_satellite_features(latitude, longitude, year, use_cache)
+                    except Exception as e:
+                        results[i] = e
+                    continue
+                
+                metadata = self._extraction_metadata()
+                if use_cache:
+                    self._store_in_cache(feature_cache_key(latitude, longitude, year, source), {
+                        'features': features,
+                        'metadata': metadata
+                    })
+                results[i] = (features, metadata)
+        
+        return results
+    
+    def _features_to_array(self, features) -> np.ndarray:
+        """Model input row from a feature dict or a vector already in model order"""
+        if isinstance(features, np.ndarray):
+            return features.reshape(1, -1)
+        return np.array(_feature_values(features)).reshape(1, -1)
+    
+    def _classify(self, scaled_features: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Class ids and class probabilities from a single pass over the forest
+        
+        For sklearn classifiers predict() is classes_[argmax(predict_proba())], so
+        deriving it here avoids walking every tree a second time.
+        """
+        probabilities = self.model.predict_proba(scaled_features)
+        return self.model.classes_.take(probabilities.argmax(axis=1)), probabilities
+    
+    def _crop_names_for(self, class_ids: np.ndarray) -> np.ndarray:
+        """Crop names for an array of class ids, "Unknown" for ids outside the mapping"""
+        class_ids = np.asarray(class_ids)
+        known = (class_ids > 0) & (class_ids < len(self.crop_names))
+        return self.crop_names[np.where(known, class_ids, 0)]
+    
     def _predict_crop(self, features: Dict[str, float]) -> Dict[str, Any]:
         """Make crop prediction using ML model"""
         try:
             # Convert features to array in correct order
-            feature_array = np.array([
-                features['nitrogen'],
-                features['phosphorus'],
-                features['potassium'],
-                features['temperature'],
-                features['humidity'],
-                features['ph'],
-                features['rainfall']
-            ]).reshape(1, -1)
+            feature_array = self._features_to_array(features)
             
             # Apply scaling (use only MinMaxScaler as the model was trained with it)
-            scaled_features = self.minmax_scaler.transform(feature_array)
+            scaled_features = self.feature_scaler.transform(feature_array)
             
             # Make prediction
-            prediction = self.model.predict(scaled_features)[0]
-            probabilities = self.model.predict_proba(scaled_features)[0]
+            class_ids, probabilities = self._classify(scaled_features)
+            prediction, probabilities = class_ids[0], probabilities[0]
             
             # Get confidence score
             confidence = float(np.max(probabilities))
             
             # Get crop name
-            crop_name = self.crop_dict.get(prediction, "Unknown")
+            crop_name = self._crop_names_for(class_ids)[0]
             
             return {
                 'class_id': int(prediction),
@@ -504,43 +761,39 @@ class UltraIntegrationBridge:
         """Get alternative crop recommendations with confidence scores"""
         try:
             # Convert features to array in correct order
-            feature_array = np.array([
-                features['nitrogen'],
-                features['phosphorus'],
-                features['potassium'],
-                features['temperature'],
-                features['humidity'],
-                features['ph'],
-                features['rainfall']
-            ]).reshape(1, -1)
+            feature_array = self._features_to_array(features)
             
             # Apply scaling (use only MinMaxScaler as the model was trained with it)
-            scaled_features = self.minmax_scaler.transform(feature_array)
+            scaled_features = self.feature_scaler.transform(feature_array)
             
             # Get all crop probabilities
             probabilities = self.model.predict_proba(scaled_features)[0]
             
-            # Create list of (crop_id, probability) pairs
-            crop_probs = [(i+1, prob) for i, prob in enumerate(probabilities)]
-            
-            # Sort by probability (descending) and exclude the primary crop
-            crop_probs = sorted(crop_probs, key=lambda x: x[1], reverse=True)
-            crop_probs = [cp for cp in crop_probs if cp[0] != primary_crop_id]
-            
-            # Get top 3 alternatives with crop names and confidence percentages
-            alternatives = []
-            for crop_id, prob in crop_probs[:3]:
-                crop_name = self.crop_dict.get(crop_id, f"Crop_{crop_id}")
-                confidence = float(prob * 100)  # Convert to percentage
-                alternatives.append((crop_name, confidence))
-            
-            return alternatives
+            return self._alternatives_from_probabilities(probabilities, primary_crop_id)
             
         except Exception as e:
             logger.error(f"Alternative crops prediction failed: {e}")
             # Return some default alternatives
             return [("Maize", 65.0), ("Rice", 60.0), ("Wheat", 55.0)]
     
+    def _alternatives_from_probabilities(self, probabilities, primary_crop_id: int) -> List[Tuple[str, float]]:
+        """Top 3 crops other than the primary one, with confidence percentages"""
+        # Create list of (crop_id, probability) pairs
+        crop_probs = [(i+1, prob) for i, prob in enumerate(probabilities)]
+        
+        # Sort by probability (descending) and exclude the primary crop
+        crop_probs = sorted(crop_probs, key=lambda x: x[1], reverse=True)
+        crop_probs = [cp for cp in crop_probs if cp[0] != primary_crop_id]
+        
+        # Get top 3 alternatives with crop names and confidence percentages
+        alternatives = []
+        for crop_id, prob in crop_probs[:3]:
+            crop_name = self.crop_dict.get(crop_id, f"Crop_{crop_id}")
+            confidence = float(prob * 100)  # Convert to percentage
+            alternatives.append((crop_name, confidence))
+        
+        return alternatives
+    
     def _get_regional_context(self, latitude: float, longitude: float) -> Dict[str, Any]:
         """Get additional regional context information"""
         # Determine climate zone
@@ -609,14 +862,12 @@ class UltraIntegrationBridge:
                 return {'season': 'Fall', 'growing_season': 'Harvest'}
     
     def _get_from_cache(self, key: str) -> Optional[Dict]:
-        """Get item from cache (placeholder for actual cache implementation)"""
-        # This would integrate with Redis, Memcached, or in-memory cache
-        return None
+        """Get extracted features from the feature cache"""
+        return self.feature_cache.get(key)
     
     def _store_in_cache(self, key: str, value: Dict):
-        """Store item in cache (placeholder for actual cache implementation)"""
-        # This would integrate with Redis, Memcached, or in-memory cache
-        pass
+        """Store extracted features in the feature cache"""
+        self.feature_cache.set(key, value)
     
     def _update_stats(self, processing_time: float):
         """Update performance statistics"""
@@ -642,23 +893,19 @@ class UltraIntegrationBridge:
     async def batch_process_locations(self, 
                                     locations: List[Tuple[float, float]], 
                                     year: int = 2024) -> List[CropRecommendationResponse]:
-        """Process multiple locations in parallel"""
+        """Process multiple locations in one vectorized batch"""
+        requests = [
+            CropRecommendationRequest(latitude=lat, longitude=lon, year=year)
+            for lat, lon in locations
+        ]
+        
         if not self.enable_async:
-            # Fallback to sequential processing
-            results = []
-            for lat, lon in locations:
-                request = CropRecommendationRequest(latitude=lat, longitude=lon, year=year)
-                results.append(self.get_crop_recommendation(request))
-            return results
-        
-        # Async batch processing
-        tasks = []
-        for lat, lon in locations:
-            request = CropRecommendationRequest(latitude=lat, longitude=lon, year=year)
-            task = self.get_crop_recommendation_async(request)
-            tasks.append(task)
-        
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+            # Fallback to running the batch on the caller's thread
+            results = self.get_crop_recommendations_batch(requests)
+        else:
+            # One executor hop for the whole batch instead of a task per location
+            loop = asyncio.get_running_loop()
+            results = await loop.run_in_executor(None, self.get_crop_recommendations_batch, requests)
         
         # Filter out exceptions and log them
         valid_results = []
@@ -127,27 +127,29 @@ class AdvancedFeatureExtractor:
     def _get_temporal_embeddings(self, lat: float, lon: float, year: int) -> List[np.ndarray]:
         """Get embeddings for multiple time periods"""
         point = ee.Geometry.Point([lon, lat])
-        dataset = ee.ImageCollection('GOOGLE/SATELLITE_EMBEDDING/V1/ANNUAL')
-        
-        embeddings_series = []
+        years = range(year-2, year+1)
+        
+        # Get 3 years of data for temporal analysis. The per-year point samples are
+        # built server-side and fetched with a single getInfo() instead of one per year.
+        annual = ee.ImageCollection('GOOGLE/SATELLITE_EMBEDDING/V1/ANNUAL')\
+                   .filterBounds(point)\
+                   .filterDate(f'{years[0]}-01-01', f'{years[-1]+1}-01-01')
+        samples = annual.map(lambda image: ee.Feature(
+            None, image.reduceRegion(reducer=ee.Reducer.first(), geometry=point, scale=10)
+        ).set('year', image.date().get('year')))
+        
+        by_year: Dict[int, np.ndarray] = {}
+        try:
+            for feature in samples.getInfo().get('features', []):
+                props = feature['properties']
+                values = [props.get(f'A{i:02d}') for i in range(64)]
+                # Masked pixels come back as None; keep the first usable image per year
+                if None not in values:
+                    by_year.setdefault(int(props['year']), np.array(values))
+        except Exception as e:
+            logger.warning(f"Could not get embeddings for years {years[0]}-{years[-1]}: {e}")
         
-        # Get 3 years of data for temporal analysis
-        for y in range(year-2, year+1):
-            try:
-                filtered = dataset.filterBounds(point).filterDate(f'{y}-01-01', f'{y+1}-01-01')
-                image = filtered.first()
-                
-                if image:
-                    sample = image.sample(region=point, scale=10, numPixels=1)
-                    sample_list = sample.getInfo()
-                    
-                    if sample_list and sample_list['features']:
-                        props = sample_list['features'][0]['properties']
-                        embedding = np.array([props[f'A{i:02d}'] for i in range(64)])
-                        embeddings_series.append(embedding)
-                        
-            except Exception as e:
-                logger.warning(f"Could not get embeddings for year {y}: {e}")
+        embeddings_series = [by_year[y] for y in years if y in by_year]
         
         # If we don't have enough temporal data, duplicate the latest
         while len(embeddings_series) < 3:
@@ -5,15 +5,51 @@ Handles saving and retrieving crop analysis results for SMS sending
 """
 
 import os
+import sys
 import logging
+import sqlite3
+import threading
+from collections import Counter
+from functools import lru_cache
 from typing import Dict, List, Optional
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from datetime import datetime
 import json
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
-@dataclass
+# __slots__ dataclasses need Python 3.10+; older interpreters keep __dict__ instances
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+# Indexed columns of the results table; remaining fields live in the JSON payload
+_COLUMNS = ('id', 'timestamp', 'location_name', 'latitude', 'longitude',
+            'recommended_crop', 'confidence_score')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id TEXT PRIMARY KEY,
+    timestamp TEXT,
+    location_name TEXT,
+    latitude REAL,
+    longitude REAL,
+    recommended_crop TEXT,
+    confidence_score REAL,
+    payload TEXT
+)
+"""
+
+_TIMESTAMP_INDEX = "CREATE INDEX IF NOT EXISTS results_timestamp ON results (timestamp)"
+
+# PRAGMA user_version once the legacy JSON file has been imported (or found unnecessary)
+_LEGACY_IMPORTED_VERSION = 1
+
+@dataclass(**_DATACLASS_SLOTS)
 class SavedAnalysisResult:
     """Saved analysis result structure"""
     id: str
@@ -34,57 +70,159 @@ class SavedAnalysisResult:
     def __post_init__(self):
         if self.alternative_crops is None:
             self.alternative_crops = []
+    
+    def to_dict(self) -> Dict:
+        """Shallow dict of the result fields (avoids the deep copy done by asdict)"""
+        return {
+            'id': self.id,
+            'timestamp': self.timestamp,
+            'location_name': self.location_name,
+            'latitude': self.latitude,
+            'longitude': self.longitude,
+            'recommended_crop': self.recommended_crop,
+            'confidence_score': self.confidence_score,
+            'satellite_features': self.satellite_features,
+            'region_info': self.region_info,
+            'farmer_advice_english': self.farmer_advice_english,
+            'farmer_advice_amharic': self.farmer_advice_amharic,
+            'farmer_advice_afaan_oromo': self.farmer_advice_afaan_oromo,
+            'alternative_crops': self.alternative_crops,
+            'processing_time_ms': self.processing_time_ms
+        }
 
 class AnalysisResultsManager:
     """
     Manages saved analysis results for SMS sending
+    
+    Results are stored one row per result in SQLite, so saving or deleting a
+    result touches a single row instead of rewriting every stored result.
     """
     
-    def __init__(self, data_file: str = "data/saved_analysis_results.json"):
+    def __init__(self, data_file: str = "data/saved_analysis_results.db"):
         """Initialize analysis results manager"""
         self.data_file = data_file
         self.results: Dict[str, SavedAnalysisResult] = {}
-        self._ensure_data_directory()
+        # Per-crop result counts, kept in step with self.results for O(1) summaries
+        self._crop_counts: Counter = Counter()
+        # Bumped on every write so readers can key caches on (version, ...)
+        self.version = 0
+        # Guards the database and the in-memory index together; reentrant because
+        # writers hold it across _upsert, which takes it too
+        self._lock = threading.RLock()
+        self._connect()
         self._load_results()
     
     def _ensure_data_directory(self):
         """Ensure data directory exists"""
-        os.makedirs(os.path.dirname(self.data_file), exist_ok=True)
+        os.makedirs(os.path.dirname(self.data_file) or '.', exist_ok=True)
+    
+    def _connect(self):
+        """
+        Open the SQLite database and create the results table
+        
+        If the database file can't be opened (read-only directory, locked or
+        corrupt file), results are kept in an in-memory database for this
+        process instead, so the saved-results routes keep working.
+        """
+        try:
+            self._ensure_data_directory()
+            self._conn = self._open_database(self.data_file)
+        except (sqlite3.Error, OSError) as e:
+            logger.error("Could not open results database %s (%s); saved results will not persist",
+                         self.data_file, e)
+            self._conn = self._open_database(':memory:')
+    
+    @staticmethod
+    def _open_database(path: str) -> sqlite3.Connection:
+        """Connect to a results database and make sure its schema exists"""
+        # Shared across Flask request threads; all access is serialized by self._lock
+        conn = sqlite3.connect(path, check_same_thread=False)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(_SCHEMA)
+            conn.execute(_TIMESTAMP_INDEX)
+            conn.commit()
+        except sqlite3.Error:
+            conn.close()
+            raise
+        return conn
     
     def _load_results(self):
-        """Load saved analysis results from JSON file"""
+        """Load saved analysis results from the database"""
         try:
-            if os.path.exists(self.data_file):
-                with open(self.data_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    
-                # Convert dict data back to SavedAnalysisResult objects
-                for result_id, result_data in data.items():
-                    self.results[result_id] = SavedAnalysisResult(**result_data)
-                    
-                logger.info(f"Loaded {len(self.results)} saved analysis results")
-            else:
-                logger.info("No existing analysis results file found, starting fresh")
+            with self._lock:
+                try:
+                    self._import_legacy_json()
+                except Exception as e:
+                    # Keep loading what the database already holds
+                    logger.error("Failed to import legacy analysis results: %s", e)
+                rows = self._conn.execute(
+                    f"SELECT {', '.join(_COLUMNS)}, payload FROM results ORDER BY timestamp"
+                ).fetchall()
+            
+            # Convert rows back to SavedAnalysisResult objects; self.results stays in
+            # timestamp order so listings never need to sort
+            for row in rows:
+                payload = orjson.loads(row[-1]) if ORJSON_AVAILABLE else json.loads(row[-1])
+                result = SavedAnalysisResult(**dict(zip(_COLUMNS, row)), **payload)
+                self.results[result.id] = result
+                self._crop_counts[result.recommended_crop] += 1
+                
+            logger.info(f"Loaded {len(self.results)} saved analysis results")
                 
         except Exception as e:
             logger.error(f"Failed to load analysis results: {e}")
             self.results = {}
+            self._crop_counts = Counter()
     
-    def _save_results(self):
-        """Save analysis results to JSON file"""
-        try:
-            # Convert SavedAnalysisResult objects to dict for JSON serialization
-            data = {}
-            for result_id, result in self.results.items():
-                data[result_id] = asdict(result)
-            
-            with open(self.data_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-                
-            logger.info("Analysis results saved successfully")
-            
-        except Exception as e:
-            logger.error(f"Failed to save analysis results: {e}")
+    def _import_legacy_json(self):
+        """
+        One-time import of results saved by the previous JSON-file storage
+        
+        The import is recorded in the database's user_version, so deleting every
+        saved result later doesn't bring the legacy results back on restart.
+        Databases that already hold results predate the marker and were imported
+        then, so they are only marked.
+        """
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] >= _LEGACY_IMPORTED_VERSION:
+            return
+        
+        legacy_file = os.path.splitext(self.data_file)[0] + '.json'
+        data = {}
+        if (os.path.exists(legacy_file)
+                and not self._conn.execute("SELECT 1 FROM results LIMIT 1").fetchone()):
+            with open(legacy_file, 'rb') as f:
+                raw = f.read()
+            data = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+        
+        # Rows and marker commit together, so a failed import is retried next start
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [self._to_row(SavedAnalysisResult(**result_data)) for result_data in data.values()]
+            )
+            self._conn.execute(f"PRAGMA user_version = {_LEGACY_IMPORTED_VERSION}")
+        if data:
+            logger.info(f"Imported {len(data)} analysis results from {legacy_file}")
+    
+    def _to_row(self, result: SavedAnalysisResult) -> tuple:
+        """Flatten a result into a results-table row"""
+        data = result.to_dict()
+        columns = tuple(data.pop(column) for column in _COLUMNS)
+        if ORJSON_AVAILABLE:
+            payload = orjson.dumps(data).decode('utf-8')
+        else:
+            payload = json.dumps(data, ensure_ascii=False)
+        return columns + (payload,)
+    
+    def _upsert(self, result: SavedAnalysisResult):
+        """Insert or replace a single result row"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                self._to_row(result)
+            )
     
     def save_analysis_result(self, response, location_name: str = None) -> str:
         """
@@ -98,9 +236,14 @@ class AnalysisResultsManager:
             The ID of the saved result
         """
         try:
-            # Generate unique ID
+            # Generate unique ID (plain int formatting instead of strftime; microseconds
+            # keep saves of the same location within one second apart)
             timestamp = datetime.now()
-            result_id = f"{timestamp.strftime('%Y%m%d_%H%M%S')}_{response.coordinates['latitude']:.4f}_{response.coordinates['longitude']:.4f}"
+            result_id = (
+                f"{timestamp.year:04d}{timestamp.month:02d}{timestamp.day:02d}_"
+                f"{timestamp.hour:02d}{timestamp.minute:02d}{timestamp.second:02d}_{timestamp.microsecond:06d}_"
+                f"{response.coordinates['latitude']:.4f}_{response.coordinates['longitude']:.4f}"
+            )
             
             # Create location name if not provided
             if not location_name:
@@ -124,9 +267,19 @@ class AnalysisResultsManager:
                 processing_time_ms=response.processing_time_ms
             )
             
-            # Save to memory and file
-            self.results[result_id] = saved_result
-            self._save_results()
+            # Save to database and memory
+            with self._lock:
+                self._upsert(saved_result)
+                replaced = self.results.get(result_id)
+                if replaced is not None:
+                    self._uncount(replaced.recommended_crop)
+                newest = next(reversed(self.results.values()), None)
+                self.results[result_id] = saved_result
+                if newest is not None and saved_result.timestamp < newest.timestamp:
+                    # Clock stepped backwards; restore timestamp order (rare, so a full sort is fine)
+                    self.results = dict(sorted(self.results.items(), key=lambda item: item[1].timestamp))
+                self._crop_counts[saved_result.recommended_crop] += 1
+                self.version += 1
             
             logger.info(f"Saved analysis result: {result_id} for {location_name}")
             return result_id
@@ -139,6 +292,10 @@ class AnalysisResultsManager:
         """Get all saved analysis results"""
         return self.results
     
+    def get_results_newest_first(self) -> List[SavedAnalysisResult]:
+        """Get all saved analysis results ordered by timestamp, newest first"""
+        return list(reversed(self.results.values()))
+    
     def get_result_by_id(self, result_id: str) -> Optional[SavedAnalysisResult]:
         """Get a specific analysis result by ID"""
         return self.results.get(result_id)
@@ -146,35 +303,48 @@ class AnalysisResultsManager:
     def delete_result(self, result_id: str) -> bool:
         """Delete a saved analysis result"""
         try:
-            if result_id in self.results:
-                del self.results[result_id]
-                self._save_results()
-                logger.info(f"Deleted analysis result: {result_id}")
-                return True
-            return False
+            with self._lock:
+                if result_id not in self.results:
+                    return False
+                with self._conn:
+                    self._conn.execute("DELETE FROM results WHERE id = ?", (result_id,))
+                self._uncount(self.results.pop(result_id).recommended_crop)
+                self.version += 1
+            logger.info(f"Deleted analysis result: {result_id}")
+            return True
         except Exception as e:
             logger.error(f"Failed to delete analysis result: {e}")
             return False
     
     def get_results_summary(self) -> Dict[str, int]:
         """Get summary statistics of saved results"""
-        total_results = len(self.results)
-        crops_count = {}
-        
-        for result in self.results.values():
-            crop = result.recommended_crop
-            crops_count[crop] = crops_count.get(crop, 0) + 1
-        
         return {
-            'total_results': total_results,
-            'unique_crops': len(crops_count),
-            'crops_breakdown': crops_count
+            'total_results': len(self.results),
+            'unique_crops': len(self._crop_counts),
+            'crops_breakdown': dict(self._crop_counts)
         }
+    
+    def _uncount(self, crop: str):
+        """Decrement a crop count, dropping crops that reach zero"""
+        self._crop_counts[crop] -= 1
+        if self._crop_counts[crop] <= 0:
+            del self._crop_counts[crop]
 
-# Global instance
-analysis_results_manager = AnalysisResultsManager()
+# Global instance, created on first use so importing the module doesn't open the database
+@lru_cache(maxsize=None)
+def get_results_manager() -> AnalysisResultsManager:
+    """Shared AnalysisResultsManager instance"""
+    return AnalysisResultsManager()
+
+def __getattr__(name):
+    """Keep `from features.analysis_results_manager import analysis_results_manager` working, lazily"""
+    if name == 'analysis_results_manager':
+        return get_results_manager()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 if __name__ == "__main__":
+    analysis_results_manager = get_results_manager()
+    
     # Test the analysis results manager
     print("🔧 Testing Analysis Results Manager...")
     
@@ -5,15 +5,66 @@ Handles Twilio integration and farmer contact management
 """
 
 import os
+import re
+import sys
 import logging
+import asyncio
+import atexit
+import importlib.util
+import mmap
+import operator
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime
 import json
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import msgspec
+    MSGSPEC_AVAILABLE = True
+except ImportError:
+    MSGSPEC_AVAILABLE = False
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
-@dataclass
+# __slots__ dataclasses need Python 3.10+; older interpreters keep __dict__ instances
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+# Strips everything but digits from user-entered phone numbers in one C-level pass
+_NON_DIGITS = re.compile(r'\D')
+
+# FarmerContact fields in file order; attrgetter pulls them all in one C call
+_CONTACT_FIELDS = ('name', 'phone_number', 'location', 'latitude', 'longitude',
+                   'preferred_language', 'created_at')
+_contact_values = operator.attrgetter(*_CONTACT_FIELDS)
+
+# SMS header per advice language; unknown languages fall back to English
+LANGUAGE_HEADERS = {
+    "english": "🌾 Agricultural Advice",
+    "amharic": "🌾 የእርሻ ምክር",
+    "afaan_oromo": "🌾 Gorsa Qonnaa"
+}
+
+@dataclass(**_DATACLASS_SLOTS)
 class FarmerContact:
     """Farmer contact information"""
     name: str
@@ -22,12 +73,17 @@ class FarmerContact:
     latitude: float
     longitude: float
     preferred_language: str = "english"
-    created_at: str = None
+    created_at: Optional[str] = None
     
     def __post_init__(self):
+        # Stamp new contacts, and stored ones saved with a null created_at
         if self.created_at is None:
             self.created_at = datetime.now().isoformat()
 
+if MSGSPEC_AVAILABLE:
+    # Decodes the contacts file directly into typed FarmerContact lists
+    _contacts_decoder = msgspec.json.Decoder(Dict[str, List[FarmerContact]])
+
 @dataclass
 class SMSRequest:
     """SMS sending request"""
@@ -43,6 +99,39 @@ class SMSResponse:
     message_sid: Optional[str] = None
     error_message: Optional[str] = None
     cost_estimate: Optional[str] = None
+    # True when the send was still running when the caller stopped waiting; it may yet deliver
+    pending: bool = False
+
+class TokenBucket:
+    """
+    Thread-safe token bucket used to pace outgoing SMS
+    
+    Refills at `rate` tokens per second up to `capacity`; acquire() blocks
+    until a token is available.
+    """
+    
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.last = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def acquire(self):
+        """Take one token, sleeping until the bucket has refilled if it is empty"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+                self.last = now
+                
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            
+            # Sleep without the lock so other senders can refill and take tokens meanwhile
+            time.sleep(wait)
 
 class SMSService:
     """
@@ -56,26 +145,40 @@ class SMSService:
         self.auth_token = os.getenv('AUTH_TOKEN')
         self.twilio_phone = os.getenv('TWILIO_PHONE_NUMBER', '+1234567890')  # Default placeholder
         
-        self.client = None
+        # Optional Messaging Service: Twilio load-balances across its pooled sender numbers
+        self.messaging_service_sid = os.getenv('TWILIO_MESSAGING_SERVICE_SID')
+        self.sender_pool_size = max(1, int(os.getenv('TWILIO_SENDER_POOL_SIZE', '1')))
+        
+        # Twilio allows ~1 message/second per sender number; stay under it
+        self._bucket = TokenBucket(rate=self.sender_pool_size, capacity=self.sender_pool_size)
+        
+        # The Twilio client is created on first send (see _get_client) so importing
+        # this module doesn't pay for the twilio import and client setup
+        self._client = None
+        self._client_lock = threading.Lock()
         self.available = False
         
-        # Initialize Twilio client
-        try:
-            if self.account_sid and self.auth_token:
-                from twilio.rest import Client
-                self.client = Client(self.account_sid, self.auth_token)
-                self.available = True
-                logger.info("Twilio SMS service initialized successfully")
-            else:
-                logger.warning("Twilio credentials not found in environment variables")
-        except ImportError:
+        if not (self.account_sid and self.auth_token):
+            logger.warning("Twilio credentials not found in environment variables")
+        elif importlib.util.find_spec('twilio') is None:
             logger.error("Twilio library not installed. Run: pip install twilio")
-        except Exception as e:
-            logger.error(f"Failed to initialize Twilio client: {e}")
+        else:
+            self.available = True
+            logger.info("Twilio SMS service configured")
     
     def is_available(self) -> bool:
         """Check if SMS service is available"""
-        return self.available and self.client is not None
+        return self.available
+    
+    def _get_client(self):
+        """Create the Twilio client on first use and reuse it afterwards"""
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    from twilio.rest import Client
+                    self._client = Client(self.account_sid, self.auth_token)
+                    logger.info("Twilio SMS client initialized successfully")
+        return self._client
     
     def send_agricultural_advice(self, request: SMSRequest) -> SMSResponse:
         """
@@ -95,23 +198,18 @@ class SMSService:
         
         try:
             # Format message with header
-            language_headers = {
-                "english": "🌾 Agricultural Advice",
-                "amharic": "🌾 የእርሻ ምክር",
-                "afaan_oromo": "🌾 Gorsa Qonnaa"
-            }
-            
-            header = language_headers.get(request.language, "🌾 Agricultural Advice")
+            header = LANGUAGE_HEADERS.get(request.language, LANGUAGE_HEADERS["english"])
             formatted_message = f"{header}\n\nLocation: {request.location}\n\n{request.message}"
             
             # Ensure Ethiopian phone number format
             phone = self._format_ethiopian_phone(request.phone_number)
             
-            # Send SMS via Twilio
-            message = self.client.messages.create(
+            # Send SMS via Twilio, paced to the sender pool's rate limit
+            self._bucket.acquire()
+            message = self._get_client().messages.create(
                 body=formatted_message,
-                from_=self.twilio_phone,
-                to=phone
+                to=phone,
+                **self._sender_params()
             )
             
             logger.info(f"SMS sent successfully to {phone} (SID: {message.sid})")
@@ -131,6 +229,66 @@ class SMSService:
                 error_message=error_msg
             )
     
+    def send_agricultural_advice_bulk(self, requests: List[SMSRequest]) -> List[SMSResponse]:
+        """
+        Send agricultural advice to many farmers concurrently
+        
+        Requests are dispatched in parallel, with at most one in-flight message
+        per sender number in the pool, so N farmers cost roughly one round-trip
+        per pool slot instead of N sequential round-trips.
+        
+        This is the synchronous entry point: it runs its own event loop, so it
+        can't be called from inside a running one. Async callers should await
+        send_agricultural_advice_bulk_async() instead.
+        
+        Args:
+            requests: SMS requests to send
+            
+        Returns:
+            List of SMSResponse objects in the same order as the requests
+            
+        Raises:
+            RuntimeError: If called while an event loop is running in this thread
+        """
+        if not requests:
+            return []
+        
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.send_agricultural_advice_bulk_async(requests))
+        raise RuntimeError(
+            "send_agricultural_advice_bulk() can't run inside an event loop; "
+            "await send_agricultural_advice_bulk_async() instead"
+        )
+    
+    async def send_agricultural_advice_async(self, request: SMSRequest) -> SMSResponse:
+        """
+        Async variant of send_agricultural_advice for use inside an event loop
+        
+        The Twilio call runs in the default executor. All sends share the
+        client's pooled HTTP session, so the TLS handshake happens once rather
+        than once per message.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.send_agricultural_advice, request)
+    
+    async def send_agricultural_advice_bulk_async(self, requests: List[SMSRequest]) -> List[SMSResponse]:
+        """Async variant of send_agricultural_advice_bulk: fan out sends, one in flight per sender number"""
+        semaphore = asyncio.Semaphore(self.sender_pool_size)
+        
+        async def send_one(request: SMSRequest) -> SMSResponse:
+            async with semaphore:
+                return await self.send_agricultural_advice_async(request)
+        
+        return await asyncio.gather(*(send_one(request) for request in requests))
+    
+    def _sender_params(self) -> Dict[str, str]:
+        """Sender arguments for Twilio: Messaging Service pool if configured, else the single number"""
+        if self.messaging_service_sid:
+            return {'messaging_service_sid': self.messaging_service_sid}
+        return {'from_': self.twilio_phone}
+    
     def _format_ethiopian_phone(self, phone_number: str) -> str:
         """
         Format Ethiopian phone number for international SMS
@@ -142,7 +300,7 @@ class SMSService:
             Properly formatted international phone number
         """
         # Remove all non-digit characters
-        digits = ''.join(filter(str.isdigit, phone_number))
+        digits = _NON_DIGITS.sub('', phone_number)
         
         # Handle Ethiopian phone number formats
         if digits.startswith('251'):
@@ -158,17 +316,124 @@ class SMSService:
             # Return as-is with + prefix
             return f"+{digits}"
 
+class SMSJobQueue:
+    """
+    Background queue for SMS broadcasts
+    
+    Web handlers enqueue a batch and return immediately; a single dispatcher
+    thread sends the messages through SMSService (and its rate limiter) while
+    callers poll the job for progress.
+    """
+    
+    def __init__(self, service: SMSService, max_jobs: int = 100):
+        """Initialize the job queue for the given SMS service"""
+        self.service = service
+        self.max_jobs = max_jobs
+        self.jobs: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='sms-dispatch')
+    
+    def enqueue(self, requests: List[SMSRequest]) -> str:
+        """
+        Queue SMS requests for background delivery
+        
+        Args:
+            requests: SMS requests to send
+            
+        Returns:
+            Job ID to poll with get_job()
+        """
+        job_id = uuid.uuid4().hex
+        job = {
+            'job_id': job_id,
+            'status': 'queued',
+            'total': len(requests),
+            'sent_count': 0,
+            'failed_count': 0,
+            'results': []
+        }
+        
+        with self._lock:
+            self.jobs[job_id] = job
+            # Forget the oldest jobs so finished broadcasts don't pile up
+            while len(self.jobs) > self.max_jobs:
+                self.jobs.popitem(last=False)
+        
+        self._executor.submit(self._run, job, requests)
+        logger.info(f"Queued SMS job {job_id} with {len(requests)} messages")
+        return job_id
+    
+    def get_job(self, job_id: str) -> Optional[Dict]:
+        """Get a snapshot of a job's progress"""
+        with self._lock:
+            job = self.jobs.get(job_id)
+            return dict(job, results=list(job['results'])) if job else None
+    
+    def _run(self, job: Dict, requests: List[SMSRequest]):
+        """Send a job's messages one by one, recording progress"""
+        job['status'] = 'running'
+        
+        for request in requests:
+            response = self.service.send_agricultural_advice(request)
+            
+            with self._lock:
+                if response.success:
+                    job['sent_count'] += 1
+                    job['results'].append({
+                        'phone': request.phone_number,
+                        'status': 'sent',
+                        'message_sid': response.message_sid
+                    })
+                else:
+                    job['failed_count'] += 1
+                    job['results'].append({
+                        'phone': request.phone_number,
+                        'status': 'failed',
+                        'error': response.error_message
+                    })
+        
+        job['status'] = 'completed'
+        logger.info(f"SMS job {job['job_id']} completed: {job['sent_count']} sent, {job['failed_count']} failed")
+
 class FarmerContactManager:
     """
     Manages farmer contact database for location-based SMS sending
     """
     
+    # Delay before writing so a burst of add/remove calls is written once
+    SAVE_DEBOUNCE_SECONDS = 0.25
+    # Contact files at least this large are stream-parsed instead of loaded whole
+    STREAM_LOAD_MIN_BYTES = 8 * 1024 * 1024
+    
     def __init__(self, data_file: str = "data/farmer_contacts.json"):
         """Initialize farmer contact manager"""
         self.data_file = data_file
-        self.contacts: Dict[str, List[FarmerContact]] = {}
+        # location -> {phone_number: contact}; insertion-ordered, O(1) add and remove
+        self.contacts: Dict[str, Dict[str, FarmerContact]] = {}
+        # phone_number -> {location: contact}, for O(1) duplicate checks and phone lookups
+        self._by_phone: Dict[str, Dict[str, FarmerContact]] = {}
+        # Bumped on every write so readers can key caches on (version, ...)
+        self.version = 0
+        # Running contact count, kept in step with add/remove
+        self._total_contacts = 0
+        # Writes are debounced: mutations mark the store dirty and a
+        # background thread coalesces bursts into a single file write
+        self._dirty = threading.Event()
+        self._write_lock = threading.Lock()
+        # pid that owns the running writer thread; threads don't survive fork(), so a
+        # forked worker (e.g. gunicorn --preload) starts its own on first save
+        self._flusher_pid = None
+        self._flusher_lock = threading.Lock()
+        # Per-thread transaction() state (depth, pending_save): one request thread's
+        # open block must not hold back saves made by other threads
+        self._transaction_state = threading.local()
+        # Set when a contacts file that failed to load couldn't be moved aside
+        self._writes_disabled = False
         self._ensure_data_directory()
         self._load_contacts()
+        atexit.register(self.flush)
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._reset_after_fork)
     
     def _ensure_data_directory(self):
         """Ensure data directory exists"""
@@ -178,45 +443,175 @@ class FarmerContactManager:
         """Load farmer contacts from JSON file"""
         try:
             if os.path.exists(self.data_file):
-                with open(self.data_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    
-                # Convert dict data back to FarmerContact objects
-                for location, contacts_data in data.items():
-                    self.contacts[location] = [
-                        FarmerContact(**contact_data) for contact_data in contacts_data
-                    ]
+                for location, contacts in self._iter_contacts_file():
+                    by_phone = {contact.phone_number: contact for contact in contacts}
+                    self.contacts[location] = by_phone
+                    for phone_number, contact in by_phone.items():
+                        self._by_phone.setdefault(phone_number, {})[location] = contact
+                    self._total_contacts += len(by_phone)
                     
-                logger.info(f"Loaded {sum(len(contacts) for contacts in self.contacts.values())} farmer contacts")
+                logger.info(f"Loaded {self._total_contacts} farmer contacts")
             else:
                 logger.info("No existing farmer contacts file found, starting fresh")
                 
         except Exception as e:
             logger.error(f"Failed to load farmer contacts: {e}")
             self.contacts = {}
+            self._by_phone = {}
+            self._total_contacts = 0
+            self._set_aside_unreadable_file()
+    
+    def _set_aside_unreadable_file(self):
+        """Move a contacts file that failed to load out of the way so the next save can't overwrite it"""
+        backup_file = f"{self.data_file}.unreadable-{datetime.now():%Y%m%d%H%M%S}"
+        try:
+            os.replace(self.data_file, backup_file)
+            logger.error("Unreadable contacts file kept as %s; starting with an empty store", backup_file)
+        except OSError as e:
+            self._writes_disabled = True
+            logger.error("Could not set aside unreadable contacts file (%s); contact changes will not be saved", e)
+    
+    def _iter_contacts_file(self):
+        """
+        Yield (location, contacts) pairs of FarmerContact lists from the contacts file
+        
+        Large files are stream-parsed with ijson when available so only one
+        location's contacts are materialized at a time; smaller files are
+        parsed in one go, which is faster. msgspec, when installed, decodes
+        straight into FarmerContact objects in C.
+        """
+        if IJSON_AVAILABLE and os.path.getsize(self.data_file) >= self.STREAM_LOAD_MIN_BYTES:
+            with open(self.data_file, 'rb') as f:
+                for location, contacts_data in ijson.kvitems(f, '', use_float=True):
+                    yield location, [FarmerContact(**contact_data) for contact_data in contacts_data]
+            return
+        
+        if MSGSPEC_AVAILABLE or ORJSON_AVAILABLE:
+            # Parse straight from a read-only mapping instead of copying the file into bytes
+            with open(self.data_file, 'rb') as f, \
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+                    memoryview(mm) as view:
+                contacts = None
+                if MSGSPEC_AVAILABLE:
+                    try:
+                        contacts = _contacts_decoder.decode(view)
+                    except (msgspec.ValidationError, msgspec.DecodeError) as e:
+                        # The typed decoder rejects records FarmerContact(**d) accepts (numeric
+                        # phone numbers, nulls), so retry with the lenient path below
+                        logger.warning("Strict contacts decode failed, parsing leniently: %s", e)
+                if contacts is None:
+                    data = orjson.loads(view) if ORJSON_AVAILABLE else json.loads(bytes(view))
+            if contacts is not None:
+                yield from contacts.items()
+                return
+        else:
+            with open(self.data_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        
+        # Convert dict data back to FarmerContact objects
+        for location, contacts_data in data.items():
+            yield location, [FarmerContact(**contact_data) for contact_data in contacts_data]
     
     def _save_contacts(self):
+        """Schedule a write of farmer contacts to the JSON file"""
+        state = self._transaction_state
+        if getattr(state, 'depth', 0):
+            state.pending_save = True
+            return
+        self._ensure_flusher()
+        self._dirty.set()
+    
+    def _ensure_flusher(self):
+        """Start the background writer for the current process if it isn't running"""
+        pid = os.getpid()
+        if self._flusher_pid == pid:
+            return
+        with self._flusher_lock:
+            if self._flusher_pid != pid:
+                threading.Thread(target=self._flush_loop, daemon=True).start()
+                self._flusher_pid = pid
+    
+    def _reset_after_fork(self):
+        """Replace locks that may have been held by another thread when the process forked"""
+        self._write_lock = threading.Lock()
+        self._flusher_lock = threading.Lock()
+    
+    @contextmanager
+    def transaction(self):
+        """
+        Group several add/remove calls into a single write of the contacts file
+        
+        Mutations inside the block update the in-memory store as usual; the file
+        is written once when the outermost block exits. Only saves made by the
+        calling thread are deferred, so other threads' writes proceed meanwhile.
+        """
+        state = self._transaction_state
+        state.depth = getattr(state, 'depth', 0) + 1
+        try:
+            yield self
+        finally:
+            state.depth -= 1
+            if not state.depth and getattr(state, 'pending_save', False):
+                state.pending_save = False
+                self._dirty.set()
+                self.flush()
+    
+    def _flush_loop(self):
+        """Background writer: wait for changes, let a burst settle, then write once"""
+        while True:
+            self._dirty.wait()
+            time.sleep(self.SAVE_DEBOUNCE_SECONDS)
+            self.flush()
+    
+    def flush(self):
+        """Write pending contact changes to disk immediately"""
+        with self._write_lock:
+            if not self._dirty.is_set():
+                return
+            # Cleared before writing so changes made during the write trigger another one
+            self._dirty.clear()
+            self._write_contacts()
+    
+    def _write_contacts(self):
         """Save farmer contacts to JSON file"""
+        if self._writes_disabled:
+            logger.error("Not saving farmer contacts: %s failed to load and would be overwritten", self.data_file)
+            return
+        
         try:
-            # Convert FarmerContact objects to dict for JSON serialization
-            data = {}
-            for location, contacts in self.contacts.items():
-                data[location] = [
-                    {
-                        'name': contact.name,
-                        'phone_number': contact.phone_number,
-                        'location': contact.location,
-                        'latitude': contact.latitude,
-                        'longitude': contact.longitude,
-                        'preferred_language': contact.preferred_language,
-                        'created_at': contact.created_at
-                    }
-                    for contact in contacts
-                ]
+            # Shallow snapshot so request threads can keep mutating while we serialize
+            snapshot = {location: list(by_phone.values()) for location, by_phone in dict(self.contacts).items()}
             
-            with open(self.data_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            if ORJSON_AVAILABLE:
+                # orjson serializes the FarmerContact dataclasses natively
+                payload = orjson.dumps(snapshot, option=orjson.OPT_INDENT_2)
+            else:
+                # Convert FarmerContact objects to dict for JSON serialization
+                data = {
+                    location: [dict(zip(_CONTACT_FIELDS, _contact_values(contact))) for contact in contacts]
+                    for location, contacts in snapshot.items()
+                }
                 
+                payload = json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+            
+            # Write a uniquely named temp file and swap it in, so a crash mid-write never leaves
+            # a truncated store and processes sharing the data directory never share a temp file
+            data_dir, data_name = os.path.split(self.data_file)
+            with tempfile.NamedTemporaryFile('wb', dir=data_dir or '.', prefix=data_name + '.',
+                                             suffix='.tmp', delete=False) as f:
+                tmp_file = f.name
+                try:
+                    f.write(payload)
+                    f.flush()
+                    os.fsync(f.fileno())
+                    # mkstemp creates files 0600; keep the store readable like a normal open() would
+                    os.chmod(tmp_file, 0o644)
+                except BaseException:
+                    f.close()
+                    os.unlink(tmp_file)
+                    raise
+            os.replace(tmp_file, self.data_file)
+            
             logger.info("Farmer contacts saved successfully")
             
         except Exception as e:
@@ -233,16 +628,16 @@ class FarmerContactManager:
             True if added successfully, False otherwise
         """
         try:
-            if farmer.location not in self.contacts:
-                self.contacts[farmer.location] = []
-            
             # Check for duplicate phone numbers in the same location
-            existing_phones = [f.phone_number for f in self.contacts[farmer.location]]
-            if farmer.phone_number in existing_phones:
+            same_phone = self._by_phone.setdefault(farmer.phone_number, {})
+            if farmer.location in same_phone:
                 logger.warning(f"Farmer with phone {farmer.phone_number} already exists in {farmer.location}")
                 return False
             
-            self.contacts[farmer.location].append(farmer)
+            self.contacts.setdefault(farmer.location, {})[farmer.phone_number] = farmer
+            self._total_contacts += 1
+            same_phone[farmer.location] = farmer
+            self.version += 1
             self._save_contacts()
             
             logger.info(f"Added farmer {farmer.name} in {farmer.location}")
@@ -254,7 +649,15 @@ class FarmerContactManager:
     
     def get_farmers_by_location(self, location: str) -> List[FarmerContact]:
         """Get all farmers in a specific location"""
-        return self.contacts.get(location, [])
+        return list(self.contacts.get(location, {}).values())
+    
+    def get_farmers_by_phone(self, phone_number: str) -> List[FarmerContact]:
+        """Get every contact registered with a phone number, across all locations"""
+        return list(self._by_phone.get(phone_number, {}).values())
+    
+    def get_total_contacts(self) -> int:
+        """Get the number of farmer contacts across all locations"""
+        return self._total_contacts
     
     def get_all_locations(self) -> List[str]:
         """Get all available locations"""
@@ -262,21 +665,24 @@ class FarmerContactManager:
     
     def get_all_farmers(self) -> Dict[str, List[FarmerContact]]:
         """Get all farmers organized by location"""
-        return self.contacts
+        return {location: list(by_phone.values()) for location, by_phone in self.contacts.items()}
     
     def remove_farmer(self, location: str, phone_number: str) -> bool:
         """Remove a farmer by location and phone number"""
         try:
             if location in self.contacts:
-                self.contacts[location] = [
-                    f for f in self.contacts[location] 
-                    if f.phone_number != phone_number
-                ]
+                same_phone = self._by_phone.get(phone_number, {})
+                same_phone.pop(location, None)
+                if self.contacts[location].pop(phone_number, None) is not None:
+                    self._total_contacts -= 1
+                if not same_phone:
+                    self._by_phone.pop(phone_number, None)
                 
                 # Remove empty locations
                 if not self.contacts[location]:
                     del self.contacts[location]
                 
+                self.version += 1
                 self._save_contacts()
                 logger.info(f"Removed farmer with phone {phone_number} from {location}")
                 return True
@@ -287,11 +693,39 @@ class FarmerContactManager:
             logger.error(f"Failed to remove farmer: {e}")
             return False
 
-# Global instances
-sms_service = SMSService()
-farmer_manager = FarmerContactManager()
+# Global instances, created on first use so importing this module (e.g. just for
+# FarmerContact) doesn't touch the filesystem or Twilio
+@lru_cache(maxsize=None)
+def get_sms_service() -> SMSService:
+    """Shared SMSService instance"""
+    return SMSService()
+
+@lru_cache(maxsize=None)
+def get_sms_job_queue() -> SMSJobQueue:
+    """Shared SMSJobQueue instance backed by the shared SMSService"""
+    return SMSJobQueue(get_sms_service())
+
+@lru_cache(maxsize=None)
+def get_farmer_manager() -> FarmerContactManager:
+    """Shared FarmerContactManager instance"""
+    return FarmerContactManager()
+
+_GLOBAL_ACCESSORS = {
+    'sms_service': get_sms_service,
+    'sms_job_queue': get_sms_job_queue,
+    'farmer_manager': get_farmer_manager,
+}
+
+def __getattr__(name):
+    """Keep `from features.sms_service import sms_service` etc. working, lazily"""
+    if name in _GLOBAL_ACCESSORS:
+        return _GLOBAL_ACCESSORS[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 if __name__ == "__main__":
+    sms_service = get_sms_service()
+    farmer_manager = get_farmer_manager()
+    
     # Test SMS service
     print("🔧 Testing SMS Service...")
     print(f"SMS Service Available: {sms_service.is_available()}")
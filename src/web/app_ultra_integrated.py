@@ -3,17 +3,22 @@ Ultra-Integrated Flask Application
 Seamlessly connects AlphaEarth satellite data with crop recommendation ML model
 """
 
-from flask import Flask, request, render_template, jsonify
+from flask import Flask, request, render_template, jsonify, stream_with_context
 import asyncio
+import atexit
 import logging
+import operator
 from typing import Dict, List, Any
 import time
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+from functools import lru_cache
+from types import SimpleNamespace
 import json
+import numpy as np
 
 import sys
 import os
-import logging
+import threading
 
 # Configure logging first
 logging.basicConfig(level=logging.INFO)
@@ -27,31 +32,156 @@ if 'GOOGLE_CLOUD_PROJECT' not in os.environ:
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from core.integration_bridge import UltraIntegrationBridge, CropRecommendationRequest
-from features.sms_service import sms_service, farmer_manager, FarmerContact, SMSRequest
-from features.analysis_results_manager import analysis_results_manager
+from features.sms_service import (get_sms_service, get_sms_job_queue, get_farmer_manager,
+                                  FarmerContact, SMSRequest, SMSResponse)
+from features.analysis_results_manager import get_results_manager
+
+# The ultra integration bridge loads the ML model, scalers and Earth Engine auth, so it
+# is built on first use rather than at import; a failed build is remembered as None
+_bridge = None
+_bridge_loaded = False
+_bridge_lock = threading.Lock()
+
+def get_bridge():
+    """Shared UltraIntegrationBridge, or None if it could not be initialized"""
+    global _bridge, _bridge_loaded
+    if not _bridge_loaded:
+        with _bridge_lock:
+            if not _bridge_loaded:
+                try:
+                    # Use relative paths that will be resolved by the integration bridge
+                    _bridge = UltraIntegrationBridge(
+                        model_path='model.pkl',  # Will be resolved to models/model.pkl
+                        scaler_paths=('minmaxscaler_fixed.pkl', 'standscaler_fixed.pkl'),  # Will be resolved to models/
+                        earth_engine_credentials=None,  # Will try default auth
+                        cache_size=1000,
+                        enable_async=True
+                    )
+                    logger.info("Ultra Integration Bridge initialized successfully")
+                except Exception as e:
+                    logger.error("Failed to initialize bridge: %s", e)
+                    _bridge = None
+                _bridge_loaded = True
+    return _bridge
+
+# Shared services, created on first use so nothing touches disk or starts threads at
+# import time (and so a preloading master never forks them half-initialized)
+_LAZY_GLOBALS = {
+    'bridge': get_bridge,
+    'sms_service': get_sms_service,
+    'sms_job_queue': get_sms_job_queue,
+    'farmer_manager': get_farmer_manager,
+    'analysis_results_manager': get_results_manager,
+}
+
+def __getattr__(name):
+    """Keep `from app_ultra_integrated import bridge` (and the shared services) working, lazily"""
+    if name in _LAZY_GLOBALS:
+        return _LAZY_GLOBALS[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# With `gunicorn --preload`, build the bridge in the master so forked workers share
+# the loaded model pages copy-on-write
+if os.environ.get('PRELOAD_BRIDGE') == '1':
+    get_bridge()
+
+# Shared worker pool for request fan-out work; kept warm across requests instead
+# of spinning up threads per request
+BATCH_EXECUTOR = ThreadPoolExecutor(
+    max_workers=int(os.environ.get('BATCH_WORKERS', '16')),
+    thread_name_prefix='batch'
+)
+atexit.register(BATCH_EXECUTOR.shutdown)
+
+# Per-broadcast cap on queued SMS sends and how long to wait for each one
+SMS_MAX_IN_FLIGHT = 16
+SMS_SEND_TIMEOUT_SECONDS = 10
+
+# SMS sends block on the sender rate limit, so they get their own pool rather than
+# tying up BATCH_EXECUTOR workers that recommendation batches are waiting on
+SMS_EXECUTOR = ThreadPoolExecutor(
+    max_workers=SMS_MAX_IN_FLIGHT,
+    thread_name_prefix='sms'
+)
+atexit.register(SMS_EXECUTOR.shutdown)
+
+# Numba is optional: without it the batch coordinate check runs as plain Python
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    
+    def njit(*args, **kwargs):
+        return lambda func: func
+
+# orjson is optional: when installed it replaces the stdlib encoder for all JSON responses
+try:
+    import orjson
+    from flask.json.provider import DefaultJSONProvider
+    
+    class ORJSONProvider(DefaultJSONProvider):
+        """Flask JSON provider backed by orjson"""
+        
+        def dumps(self, obj, **kwargs):
+            # OPT_NON_STR_KEYS: the stdlib encoder accepts int/float dict keys, keep parity
+            return orjson.dumps(
+                obj, default=self.default, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+            ).decode()
+        
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+    
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
-# Initialize the ultra integration bridge
+# pydantic v2 is optional: when installed, single-location requests are validated and
+# coerced by pydantic-core, and malformed input is answered with a 400
 try:
-    # Use relative paths that will be resolved by the integration bridge
-    bridge = UltraIntegrationBridge(
-        model_path='model.pkl',  # Will be resolved to models/model.pkl
-        scaler_paths=('minmaxscaler_fixed.pkl', 'standscaler_fixed.pkl'),  # Will be resolved to models/
-        earth_engine_credentials=None,  # Will try default auth
-        cache_size=1000,
-        enable_async=True
-    )
-    logger.info("Ultra Integration Bridge initialized successfully")
-except Exception as e:
-    logger.error(f"Failed to initialize bridge: {e}")
-    bridge = None
+    from pydantic import BaseModel, ValidationError
+    
+    if not hasattr(BaseModel, 'model_validate'):
+        raise ImportError("pydantic v2 required")
+    
+    class SingleRecommendationBody(BaseModel):
+        """JSON body of a single-location /api/recommend request"""
+        latitude: float
+        longitude: float
+        year: int = 2024
+        buffer_meters: int = 1000
+        use_cache: bool = True
+        confidence_threshold: float = 0.7
+    
+    PYDANTIC_AVAILABLE = True
+except ImportError:
+    PYDANTIC_AVAILABLE = False
 
 # Create Flask app
 app = Flask(__name__)
+if ORJSON_AVAILABLE:
+    app.json = ORJSONProvider(app)
+else:
+    # Key order doesn't matter to clients; skip sorting every response
+    app.json.sort_keys = False
+
+# Templates only change on disk during development. Outside debug, skip Jinja's
+# per-render mtime check and resolve the page templates once at import;
+# render_template accepts either a template name or a loaded Template.
+TEMPLATE_RELOAD = os.environ.get('FLASK_DEBUG') == '1'
+app.config['TEMPLATES_AUTO_RELOAD'] = TEMPLATE_RELOAD
+
+def _page_template(name: str):
+    """Template name in development (reloaded on change), preloaded Template otherwise"""
+    return name if TEMPLATE_RELOAD else app.jinja_env.get_template(name)
+
+INDEX_TEMPLATE = _page_template('index_ultra_integrated.html')
+ADMIN_TEMPLATE = _page_template('admin.html')
 
 @app.route('/')
 def index():
     """Main page with ultra-integrated interface"""
-    return render_template("index_ultra_integrated.html")
+    return render_template(INDEX_TEMPLATE)
 
 @app.route('/api/recommend', methods=['POST'])
 def api_recommend():
@@ -59,6 +189,7 @@ def api_recommend():
     Ultra-fast API endpoint for crop recommendation
     Supports both single and batch requests
     """
+    bridge = get_bridge()
     try:
         if bridge is None:
             return jsonify({'error': 'Integration bridge not available'}), 500
@@ -73,20 +204,37 @@ def api_recommend():
         return handle_single_request(data)
         
     except Exception as e:
-        logger.error(f"API recommendation failed: {e}")
+        logger.error("API recommendation failed: %s", e)
         return jsonify({'error': str(e)}), 500
 
+# Satellite features returned by the single-location endpoint; missing ones read as 0
+_SATELLITE_KEYS = ('nitrogen', 'phosphorus', 'potassium', 'temperature', 'humidity', 'ph', 'rainfall')
+_SATELLITE_DEFAULTS = dict.fromkeys(_SATELLITE_KEYS, 0)
+_satellite_values = operator.itemgetter(*_SATELLITE_KEYS)
+
 def handle_single_request(data: Dict) -> Dict:
     """Handle single location request"""
+    analysis_results_manager = get_results_manager()
+    bridge = get_bridge()
     # Create request object
-    req = CropRecommendationRequest(
-        latitude=float(data['latitude']),
-        longitude=float(data['longitude']),
-        year=int(data.get('year', 2024)),
-        buffer_meters=int(data.get('buffer_meters', 1000)),
-        use_cache=bool(data.get('use_cache', True)),
-        confidence_threshold=float(data.get('confidence_threshold', 0.7))
-    )
+    if PYDANTIC_AVAILABLE:
+        try:
+            body = SingleRecommendationBody.model_validate(data)
+        except ValidationError as e:
+            return jsonify({
+                'error': 'Invalid request',
+                'details': e.errors(include_url=False, include_context=False)
+            }), 400
+        req = CropRecommendationRequest(**body.model_dump())
+    else:
+        req = CropRecommendationRequest(
+            latitude=float(data['latitude']),
+            longitude=float(data['longitude']),
+            year=int(data.get('year', 2024)),
+            buffer_meters=int(data.get('buffer_meters', 1000)),
+            use_cache=bool(data.get('use_cache', True)),
+            confidence_threshold=float(data.get('confidence_threshold', 0.7))
+        )
     
     # Get recommendation
     response = bridge.get_crop_recommendation(req)
@@ -96,9 +244,9 @@ def handle_single_request(data: Dict) -> Dict:
         location_name = f"{req.latitude:.4f}, {req.longitude:.4f}"
         saved_result_id = analysis_results_manager.save_analysis_result(response, location_name)
         if saved_result_id:
-            logger.info(f"Auto-saved analysis result: {saved_result_id}")
+            logger.info("Auto-saved analysis result: %s", saved_result_id)
     except Exception as e:
-        logger.warning(f"Failed to auto-save analysis result: {e}")
+        logger.warning("Failed to auto-save analysis result: %s", e)
     
     # Convert to JSON-serializable format
     response_data = {
@@ -108,15 +256,10 @@ def handle_single_request(data: Dict) -> Dict:
             'confidence': response.confidence_score,
             'class_id': response.crop_class_id
         },
-        'satellite_data': {
-            'nitrogen': response.satellite_features.get('nitrogen', 0),
-            'phosphorus': response.satellite_features.get('phosphorus', 0),
-            'potassium': response.satellite_features.get('potassium', 0),
-            'temperature': response.satellite_features.get('temperature', 0),
-            'humidity': response.satellite_features.get('humidity', 0),
-            'ph': response.satellite_features.get('ph', 0),
-            'rainfall': response.satellite_features.get('rainfall', 0)
-        },
+        'satellite_data': dict(zip(
+            _SATELLITE_KEYS,
+            _satellite_values({**_SATELLITE_DEFAULTS, **response.satellite_features})
+        )),
         'alternative_crops': response.alternative_crops,
         'farmer_advice': {
             'available': response.advice_available,
@@ -135,8 +278,17 @@ def handle_single_request(data: Dict) -> Dict:
     
     return jsonify(response_data)
 
+@njit(cache=True)
+def _first_invalid_coordinate(coordinates):
+    """Index of the first (lat, lon) row outside valid ranges (or NaN), -1 if all valid"""
+    for i in range(coordinates.shape[0]):
+        if not (-90.0 <= coordinates[i, 0] <= 90.0 and -180.0 <= coordinates[i, 1] <= 180.0):
+            return i
+    return -1
+
 def handle_batch_request(data: Dict) -> Dict:
     """Handle batch location requests"""
+    bridge = get_bridge()
     locations = data['locations']
     year = int(data.get('year', 2024))
     
@@ -144,95 +296,135 @@ def handle_batch_request(data: Dict) -> Dict:
         return jsonify({'error': 'Batch size limited to 100 locations'}), 400
     
     # Process batch
-    start_time = time.time()
+    start_ns = time.perf_counter_ns()
+    
+    # Parse all coordinates into one (N, 2) array and range-check them in a single pass
+    coordinates = np.array(
+        [(loc['latitude'], loc['longitude']) for loc in locations], dtype=np.float64
+    ).reshape(-1, 2)
+    invalid_index = _first_invalid_coordinate(coordinates)
+    if invalid_index >= 0:
+        return jsonify({'error': f'Invalid coordinates for location {invalid_index}'}), 400
     
     # Create requests
-    requests = []
-    for loc in locations:
-        req = CropRecommendationRequest(
-            latitude=float(loc['latitude']),
-            longitude=float(loc['longitude']),
-            year=year,
-            use_cache=True
-        )
-        requests.append(req)
+    requests = [
+        CropRecommendationRequest(latitude=lat, longitude=lon, year=year, use_cache=True)
+        for lat, lon in coordinates.tolist()
+    ]
     
-    # Process in parallel using thread pool
+    # One vectorized pass over the whole batch; the per-location advice isn't part
+    # of the batch response, so skip generating it
     results = []
-    with ThreadPoolExecutor(max_workers=10) as executor:
-        futures = [executor.submit(bridge.get_crop_recommendation, req) for req in requests]
-        
-        for i, future in enumerate(futures):
-            try:
-                response = future.result(timeout=30)  # 30 second timeout
-                results.append({
-                    'location_index': i,
-                    'latitude': locations[i]['latitude'],
-                    'longitude': locations[i]['longitude'],
-                    'crop': response.recommended_crop,
-                    'confidence': response.confidence_score,
-                    'processing_time_ms': response.processing_time_ms,
-                    'cache_hit': response.cache_hit
-                })
-            except Exception as e:
-                logger.error(f"Batch item {i} failed: {e}")
-                results.append({
-                    'location_index': i,
-                    'latitude': locations[i]['latitude'],
-                    'longitude': locations[i]['longitude'],
-                    'error': str(e)
-                })
+    successful_predictions = 0
+    try:
+        responses = BATCH_EXECUTOR.submit(
+            bridge.get_crop_recommendations_batch, requests, generate_advice=False
+        ).result(timeout=30)  # 30 second timeout
+    except FuturesTimeoutError:
+        logger.error("Batch request timed out")
+        responses = [TimeoutError('Timed out after 30 seconds')] * len(requests)
     
-    total_time = (time.time() - start_time) * 1000
+    for i, response in enumerate(responses):
+        if isinstance(response, Exception):
+            logger.error("Batch item %s failed: %s", i, response)
+            results.append({
+                'location_index': i,
+                'latitude': locations[i]['latitude'],
+                'longitude': locations[i]['longitude'],
+                'error': str(response)
+            })
+        else:
+            results.append({
+                'location_index': i,
+                'latitude': locations[i]['latitude'],
+                'longitude': locations[i]['longitude'],
+                'crop': response.recommended_crop,
+                'confidence': response.confidence_score,
+                'processing_time_ms': response.processing_time_ms,
+                'cache_hit': response.cache_hit
+            })
+            successful_predictions += 1
+    
+    elapsed_ns = time.perf_counter_ns() - start_ns
+    total_time = elapsed_ns / 1e6
     
     return jsonify({
         'success': True,
         'batch_results': results,
         'batch_metadata': {
             'total_locations': len(locations),
-            'successful_predictions': len([r for r in results if 'crop' in r]),
+            'successful_predictions': successful_predictions,
             'total_processing_time_ms': total_time,
-            'average_time_per_location_ms': total_time / len(locations)
+            'average_time_per_location_ms': elapsed_ns // len(locations) / 1e6
         }
     })
 
+# Health and stats are polled by dashboards; serve the serialized payload for a
+# couple of seconds instead of rebuilding it on every poll
+_JSON_TTL_SECONDS = 2
+_json_ttl_cache: Dict[str, tuple] = {}
+
+def _ttl_cached_json(key: str, build) -> tuple:
+    """(body, status) from build() serialized once per _JSON_TTL_SECONDS"""
+    now = time.monotonic()
+    cached = _json_ttl_cache.get(key)
+    if cached is None or cached[0] <= now:
+        payload, status = build()
+        cached = (now + _JSON_TTL_SECONDS, app.json.dumps(payload), status)
+        _json_ttl_cache[key] = cached
+    return cached[1], cached[2]
+
+def _build_health():
+    health = get_bridge().health_check()
+    return health, 200 if health['status'] == 'healthy' else 503
+
+@app.before_request
+def _health_probe_fast_path():
+    """Answer HEAD liveness probes on /api/health without running the health check"""
+    if request.method == 'HEAD' and request.path == '/api/health':
+        # Still report a bridge that failed to load, as GET does
+        return '', 200 if get_bridge() is not None else 503
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """System health check endpoint"""
+    bridge = get_bridge()
     if bridge is None:
         return jsonify({
             'status': 'unhealthy',
             'error': 'Integration bridge not available'
         }), 500
     
-    health = bridge.health_check()
-    status_code = 200 if health['status'] == 'healthy' else 503
-    
-    return jsonify(health), status_code
+    body, status_code = _ttl_cached_json('health', _build_health)
+    return _json_response(body, status_code)
 
 @app.route('/api/stats', methods=['GET'])
 def get_stats():
     """Get performance statistics"""
+    bridge = get_bridge()
     if bridge is None:
         return jsonify({'error': 'Bridge not available'}), 500
     
-    stats = bridge.get_performance_stats()
-    return jsonify(stats)
+    body, status_code = _ttl_cached_json('stats', lambda: (bridge.get_performance_stats(), 200))
+    return _json_response(body, status_code)
 
 # SMS and Admin Panel Routes
 
 @app.route('/admin')
 def admin_panel():
     """Admin panel for managing farmer contacts and saved analysis results"""
+    sms_service = get_sms_service()
+    farmer_manager = get_farmer_manager()
+    analysis_results_manager = get_results_manager()
     farmers_by_location = farmer_manager.get_all_farmers()
-    total_farmers = sum(len(farmers) for farmers in farmers_by_location.values())
+    total_farmers = farmer_manager.get_total_contacts()
     total_locations = len(farmers_by_location)
     sms_available = sms_service.is_available()
     
     # Get saved analysis results summary
     results_summary = analysis_results_manager.get_results_summary()
     
-    return render_template('admin.html',
+    return render_template(ADMIN_TEMPLATE,
                          farmers_by_location=farmers_by_location,
                          total_farmers=total_farmers,
                          total_locations=total_locations,
@@ -243,6 +435,7 @@ def admin_panel():
 @app.route('/admin/add-farmer', methods=['POST'])
 def add_farmer():
     """Add a new farmer contact"""
+    farmer_manager = get_farmer_manager()
     try:
         data = request.get_json()
         
@@ -263,12 +456,13 @@ def add_farmer():
             return jsonify({'success': False, 'error': 'Farmer already exists or invalid data'})
             
     except Exception as e:
-        logger.error(f"Error adding farmer: {e}")
+        logger.error("Error adding farmer: %s", e)
         return jsonify({'success': False, 'error': str(e)})
 
 @app.route('/admin/remove-farmer', methods=['POST'])
 def remove_farmer():
     """Remove a farmer contact"""
+    farmer_manager = get_farmer_manager()
     try:
         data = request.get_json()
         location = data['location']
@@ -282,12 +476,17 @@ def remove_farmer():
             return jsonify({'success': False, 'error': 'Farmer not found'})
             
     except Exception as e:
-        logger.error(f"Error removing farmer: {e}")
+        logger.error("Error removing farmer: %s", e)
         return jsonify({'success': False, 'error': str(e)})
 
-@app.route('/api/get-farmers-by-location/<location>')
-def get_farmers_by_location(location):
-    """Get farmers for a specific location"""
+def _json_response(body: str, status: int = 200):
+    """Wrap an already-serialized JSON body in a Flask response"""
+    return app.response_class(body, status=status, mimetype='application/json')
+
+@lru_cache(maxsize=256)
+def _farmers_by_location_json(location: str, version: int) -> str:
+    """Serialized farmer list for a location, cached per farmer_manager version"""
+    farmer_manager = get_farmer_manager()
     farmers = farmer_manager.get_farmers_by_location(location)
     
     farmers_data = []
@@ -298,15 +497,31 @@ def get_farmers_by_location(location):
             'preferred_language': farmer.preferred_language
         })
     
-    return jsonify({
+    return app.json.dumps({
         'success': True,
         'location': location,
         'farmers': farmers_data
     })
 
+@lru_cache(maxsize=1)
+def _locations_json(version: int) -> str:
+    """Serialized location list, cached per farmer_manager version"""
+    farmer_manager = get_farmer_manager()
+    return app.json.dumps({
+        'success': True,
+        'locations': farmer_manager.get_all_locations()
+    })
+
+@app.route('/api/get-farmers-by-location/<location>')
+def get_farmers_by_location(location):
+    """Get farmers for a specific location"""
+    farmer_manager = get_farmer_manager()
+    return _json_response(_farmers_by_location_json(location, farmer_manager.version))
+
 @app.route('/api/send-advice-sms', methods=['POST'])
 def send_advice_sms():
     """Send agricultural advice via SMS to farmers - DEPRECATED: Use /api/send-saved-result-sms instead"""
+    farmer_manager = get_farmer_manager()
     try:
         data = request.get_json()
         
@@ -323,99 +538,195 @@ def send_advice_sms():
                 'error': f'No farmers found for location: {location}'
             })
         
-        # Send SMS to all farmers in the location
-        sent_count = 0
-        failed_count = 0
-        results = []
-        
+        sms_requests = []
         for farmer in farmers:
             # Use farmer's preferred language if not specified
             sms_language = language if language != 'auto' else farmer.preferred_language
             
-            sms_request = SMSRequest(
+            sms_requests.append(SMSRequest(
                 phone_number=farmer.phone_number,
                 message=advice_text,
                 language=sms_language,
                 location=location
-            )
-            
-            sms_response = sms_service.send_agricultural_advice(sms_request)
-            
-            if sms_response.success:
-                sent_count += 1
-                results.append({
-                    'farmer': farmer.name,
-                    'phone': farmer.phone_number,
-                    'status': 'sent',
-                    'message_sid': sms_response.message_sid
-                })
-            else:
-                failed_count += 1
-                results.append({
-                    'farmer': farmer.name,
-                    'phone': farmer.phone_number,
-                    'status': 'failed',
-                    'error': sms_response.error_message
-                })
+            ))
+        
+        # Optionally hand the broadcast to the background dispatcher and return at once
+        if data.get('async'):
+            return _sms_job_accepted(sms_requests)
+        
+        # Send SMS to all farmers in the location
+        sms_summary = _summarize_sms_responses(farmers, _send_sms_concurrently(sms_requests))
         
         return jsonify({
             'success': True,
-            'sent_count': sent_count,
-            'failed_count': failed_count,
-            'total_farmers': len(farmers),
-            'results': results
+            **sms_summary,
+            'total_farmers': len(farmers)
         })
         
     except Exception as e:
-        logger.error(f"Error sending SMS advice: {e}")
+        logger.error("Error sending SMS advice: %s", e)
         return jsonify({
             'success': False,
             'error': str(e)
         })
 
+def _send_sms_concurrently(sms_requests: List[SMSRequest]) -> List[SMSResponse]:
+    """
+    Send SMS requests on the SMS worker pool, keeping results in request order
+    
+    At most SMS_MAX_IN_FLIGHT sends are queued at once so one large broadcast
+    cannot monopolise SMS_EXECUTOR; the service's token bucket still paces
+    the actual Twilio calls. A send that outlasts SMS_SEND_TIMEOUT_SECONDS keeps
+    running and is reported as pending, since it may still be delivered.
+    
+    Args:
+        sms_requests: SMS requests to send
+        
+    Returns:
+        List of SMSResponse objects, one per request
+    """
+    sms_service = get_sms_service()
+    send = sms_service.send_agricultural_advice
+    window = min(len(sms_requests), SMS_MAX_IN_FLIGHT)
+    futures = [SMS_EXECUTOR.submit(send, r) for r in sms_requests[:window]]
+    responses = []
+    
+    for i in range(len(sms_requests)):
+        try:
+            responses.append(futures[i].result(timeout=SMS_SEND_TIMEOUT_SECONDS))
+        except FuturesTimeoutError:
+            responses.append(SMSResponse(
+                success=False,
+                pending=True,
+                error_message='SMS send still in progress; delivery status unknown'
+            ))
+        except Exception as e:
+            responses.append(SMSResponse(success=False, error_message=str(e)))
+        
+        if i + window < len(sms_requests):
+            futures.append(SMS_EXECUTOR.submit(send, sms_requests[i + window]))
+    
+    return responses
+
+def _summarize_sms_responses(farmers: List[FarmerContact], sms_responses: List[SMSResponse]) -> Dict[str, Any]:
+    """
+    Per-farmer SMS outcomes and counts for a broadcast response
+    
+    Args:
+        farmers: Farmers the messages were addressed to
+        sms_responses: Matching SMSResponse objects, in the same order
+        
+    Returns:
+        Dictionary with sent_count, failed_count, pending_count and results
+    """
+    counts = {'sent': 0, 'failed': 0, 'pending': 0}
+    results = []
+    
+    for farmer, sms_response in zip(farmers, sms_responses):
+        result = {'farmer': farmer.name, 'phone': farmer.phone_number}
+        if sms_response.success:
+            result['status'] = 'sent'
+            result['message_sid'] = sms_response.message_sid
+        else:
+            result['status'] = 'pending' if sms_response.pending else 'failed'
+            result['error'] = sms_response.error_message
+        counts[result['status']] += 1
+        results.append(result)
+    
+    return {
+        'sent_count': counts['sent'],
+        'failed_count': counts['failed'],
+        'pending_count': counts['pending'],
+        'results': results
+    }
+
+def _sms_job_accepted(sms_requests: List[SMSRequest]):
+    """Queue SMS requests for background delivery and answer 202 Accepted"""
+    sms_job_queue = get_sms_job_queue()
+    job_id = sms_job_queue.enqueue(sms_requests)
+    return jsonify({
+        'success': True,
+        'job_id': job_id,
+        'total_farmers': len(sms_requests),
+        'status_url': f'/api/sms-jobs/{job_id}'
+    }), 202
+
+@app.route('/api/sms-jobs/<job_id>')
+def get_sms_job(job_id):
+    """Get progress of a background SMS broadcast"""
+    sms_job_queue = get_sms_job_queue()
+    job = sms_job_queue.get_job(job_id)
+    
+    if not job:
+        return jsonify({
+            'success': False,
+            'error': 'SMS job not found'
+        }), 404
+    
+    return jsonify({'success': True, **job})
+
 @app.route('/api/get-locations')
 def get_locations():
     """Get all available farmer locations"""
-    locations = farmer_manager.get_all_locations()
-    return jsonify({
+    farmer_manager = get_farmer_manager()
+    return _json_response(_locations_json(farmer_manager.version))
+
+# Listings with more saved results than this are streamed instead of cached whole
+SAVED_RESULTS_STREAM_MIN_COUNT = 500
+
+def _saved_result_summary(result) -> Dict[str, Any]:
+    """JSON-serializable summary of a saved result for the admin listing"""
+    return {
+        'id': result.id,
+        'timestamp': result.timestamp,
+        'location_name': result.location_name,
+        'latitude': result.latitude,
+        'longitude': result.longitude,
+        'recommended_crop': result.recommended_crop,
+        'confidence_score': result.confidence_score,
+        'has_english_advice': bool(result.farmer_advice_english),
+        'has_amharic_advice': bool(result.farmer_advice_amharic),
+        'has_afaan_oromo_advice': bool(result.farmer_advice_afaan_oromo),
+        'alternative_crops': result.alternative_crops
+    }
+
+@lru_cache(maxsize=1)
+def _saved_results_json(version: int) -> str:
+    """Serialized saved-results listing, cached per analysis_results_manager version"""
+    analysis_results_manager = get_results_manager()
+    # Already newest first; the manager keeps results in timestamp order
+    results = analysis_results_manager.get_results_newest_first()
+    
+    return app.json.dumps({
         'success': True,
-        'locations': locations
+        'results': [_saved_result_summary(result) for result in results],
+        'total_count': len(results)
     })
 
+def _stream_saved_results(results: List[Any]):
+    """Yield the saved-results listing as JSON chunks, one result at a time"""
+    dumps = app.json.dumps
+    yield '{"success":true,"results":['
+    for i, result in enumerate(results):
+        yield (',' if i else '') + dumps(_saved_result_summary(result))
+    yield '],"total_count":%d}' % len(results)
+
 @app.route('/api/get-saved-results')
 def get_saved_results():
     """Get all saved analysis results for admin"""
+    analysis_results_manager = get_results_manager()
     try:
-        results = analysis_results_manager.get_all_results()
-        
-        # Convert to JSON-serializable format
-        results_data = []
-        for result_id, result in results.items():
-            results_data.append({
-                'id': result.id,
-                'timestamp': result.timestamp,
-                'location_name': result.location_name,
-                'latitude': result.latitude,
-                'longitude': result.longitude,
-                'recommended_crop': result.recommended_crop,
-                'confidence_score': result.confidence_score,
-                'has_english_advice': bool(result.farmer_advice_english),
-                'has_amharic_advice': bool(result.farmer_advice_amharic),
-                'has_afaan_oromo_advice': bool(result.farmer_advice_afaan_oromo),
-                'alternative_crops': result.alternative_crops
-            })
-        
-        # Sort by timestamp (newest first)
-        results_data.sort(key=lambda x: x['timestamp'], reverse=True)
+        if len(analysis_results_manager.get_all_results()) >= SAVED_RESULTS_STREAM_MIN_COUNT:
+            # Large stores: encode per result so the full listing is never held in memory
+            results = analysis_results_manager.get_results_newest_first()
+            return app.response_class(
+                stream_with_context(_stream_saved_results(results)), mimetype='application/json'
+            )
         
-        return jsonify({
-            'success': True,
-            'results': results_data,
-            'total_count': len(results_data)
-        })
+        return _json_response(_saved_results_json(analysis_results_manager.version))
         
     except Exception as e:
-        logger.error(f"Error getting saved results: {e}")
+        logger.error("Error getting saved results: %s", e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -424,6 +735,7 @@ def get_saved_results():
 @app.route('/api/get-saved-result/<result_id>')
 def get_saved_result(result_id):
     """Get a specific saved analysis result"""
+    analysis_results_manager = get_results_manager()
     try:
         result = analysis_results_manager.get_result_by_id(result_id)
         
@@ -454,7 +766,7 @@ def get_saved_result(result_id):
         })
         
     except Exception as e:
-        logger.error(f"Error getting saved result {result_id}: {e}")
+        logger.error("Error getting saved result %s: %s", result_id, e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -463,6 +775,7 @@ def get_saved_result(result_id):
 @app.route('/api/delete-saved-result/<result_id>', methods=['DELETE'])
 def delete_saved_result(result_id):
     """Delete a saved analysis result"""
+    analysis_results_manager = get_results_manager()
     try:
         success = analysis_results_manager.delete_result(result_id)
         
@@ -478,7 +791,7 @@ def delete_saved_result(result_id):
             }), 404
             
     except Exception as e:
-        logger.error(f"Error deleting saved result {result_id}: {e}")
+        logger.error("Error deleting saved result %s: %s", result_id, e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -487,6 +800,8 @@ def delete_saved_result(result_id):
 @app.route('/api/send-saved-result-sms', methods=['POST'])
 def send_saved_result_sms():
     """Send SMS using a saved analysis result"""
+    farmer_manager = get_farmer_manager()
+    analysis_results_manager = get_results_manager()
     try:
         data = request.get_json()
         
@@ -502,14 +817,16 @@ def send_saved_result_sms():
                 'error': 'Saved result not found'
             })
         
+        # Advice text per language, looked up once for the whole broadcast
+        advice_by_language = {
+            'english': saved_result.farmer_advice_english,
+            'amharic': saved_result.farmer_advice_amharic,
+            'afaan_oromo': saved_result.farmer_advice_afaan_oromo
+        }
+        fallback_advice = saved_result.farmer_advice_english or "Agricultural advice not available in requested language."
+        
         # Get the appropriate advice text based on language
-        advice_text = None
-        if language == 'english':
-            advice_text = saved_result.farmer_advice_english
-        elif language == 'amharic':
-            advice_text = saved_result.farmer_advice_amharic
-        elif language == 'afaan_oromo':
-            advice_text = saved_result.farmer_advice_afaan_oromo
+        advice_text = advice_by_language.get(language)
         
         if not advice_text:
             return jsonify({
@@ -526,60 +843,32 @@ def send_saved_result_sms():
                 'error': f'No farmers found for location: {farmer_location}'
             })
         
-        # Send SMS to all farmers in the location
-        sent_count = 0
-        failed_count = 0
-        results = []
-        
+        sms_requests = []
         for farmer in farmers:
             # Use specified language or farmer's preferred language
             sms_language = language if language != 'auto' else farmer.preferred_language
             
-            # Get the appropriate advice text for this farmer
-            if sms_language == 'english':
-                farmer_advice_text = saved_result.farmer_advice_english
-            elif sms_language == 'amharic':
-                farmer_advice_text = saved_result.farmer_advice_amharic
-            elif sms_language == 'afaan_oromo':
-                farmer_advice_text = saved_result.farmer_advice_afaan_oromo
-            else:
-                farmer_advice_text = saved_result.farmer_advice_english  # Fallback
-            
-            if not farmer_advice_text:
-                farmer_advice_text = saved_result.farmer_advice_english or "Agricultural advice not available in requested language."
+            # Get the appropriate advice text for this farmer (English fallback)
+            farmer_advice_text = advice_by_language.get(sms_language) or fallback_advice
             
-            sms_request = SMSRequest(
+            sms_requests.append(SMSRequest(
                 phone_number=farmer.phone_number,
                 message=farmer_advice_text,
                 language=sms_language,
                 location=farmer_location
-            )
-            
-            sms_response = sms_service.send_agricultural_advice(sms_request)
-            
-            if sms_response.success:
-                sent_count += 1
-                results.append({
-                    'farmer': farmer.name,
-                    'phone': farmer.phone_number,
-                    'status': 'sent',
-                    'message_sid': sms_response.message_sid
-                })
-            else:
-                failed_count += 1
-                results.append({
-                    'farmer': farmer.name,
-                    'phone': farmer.phone_number,
-                    'status': 'failed',
-                    'error': sms_response.error_message
-                })
+            ))
+        
+        # Optionally hand the broadcast to the background dispatcher and return at once
+        if data.get('async'):
+            return _sms_job_accepted(sms_requests)
+        
+        # Send SMS to all farmers in the location
+        sms_summary = _summarize_sms_responses(farmers, _send_sms_concurrently(sms_requests))
         
         return jsonify({
             'success': True,
-            'sent_count': sent_count,
-            'failed_count': failed_count,
+            **sms_summary,
             'total_farmers': len(farmers),
-            'results': results,
             'saved_result_info': {
                 'location_name': saved_result.location_name,
                 'crop': saved_result.recommended_crop,
@@ -588,7 +877,7 @@ def send_saved_result_sms():
         })
         
     except Exception as e:
-        logger.error(f"Error sending SMS from saved result: {e}")
+        logger.error("Error sending SMS from saved result: %s", e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -597,9 +886,11 @@ def send_saved_result_sms():
 @app.route('/predict_coordinates', methods=['POST'])
 def predict_coordinates():
     """Web form endpoint for coordinate-based prediction"""
+    analysis_results_manager = get_results_manager()
+    bridge = get_bridge()
     try:
         if bridge is None:
-            return render_template('index_ultra_integrated.html', 
+            return render_template(INDEX_TEMPLATE, 
                                  error="Integration system not available")
         
         # Get form data
@@ -623,26 +914,27 @@ def predict_coordinates():
             location_name = f"{latitude:.4f}, {longitude:.4f}"
             saved_result_id = analysis_results_manager.save_analysis_result(response, location_name)
             if saved_result_id:
-                logger.info(f"Auto-saved analysis result from web form: {saved_result_id}")
+                logger.info("Auto-saved analysis result from web form: %s", saved_result_id)
         except Exception as e:
-            logger.warning(f"Failed to auto-save analysis result from web form: {e}")
+            logger.warning("Failed to auto-save analysis result from web form: %s", e)
         
         # Render result
-        return render_template('index_ultra_integrated.html',
+        return render_template(INDEX_TEMPLATE,
                              result=response,
                              input_method='coordinates')
         
     except Exception as e:
-        logger.error(f"Coordinate prediction failed: {e}")
-        return render_template('index_ultra_integrated.html',
+        logger.error("Coordinate prediction failed: %s", e)
+        return render_template(INDEX_TEMPLATE,
                              error=f"Prediction failed: {str(e)}")
 
 @app.route('/predict_manual', methods=['POST'])
 def predict_manual():
     """Manual input endpoint (fallback)"""
+    bridge = get_bridge()
     try:
         if bridge is None:
-            return render_template('index_ultra_integrated.html',
+            return render_template(INDEX_TEMPLATE,
                                  error="Integration system not available")
         
         # Get manual inputs
@@ -659,70 +951,66 @@ def predict_manual():
         # Make prediction directly
         prediction = bridge._predict_crop(features)
         
-        # Create mock response for template
-        class MockResponse:
-            def __init__(self):
-                self.recommended_crop = prediction['crop_name']
-                self.confidence_score = prediction['confidence']
-                self.satellite_features = features
-                self.processing_time_ms = 0
-                self.cache_hit = False
-                self.coordinates = {'latitude': 0, 'longitude': 0}
-                self.region_info = {'climate_zone': 'Manual Input'}
-        
-        response = MockResponse()
+        # Attribute-style stand-in for a CropRecommendationResponse, for the template
+        response = SimpleNamespace(
+            recommended_crop=prediction['crop_name'],
+            confidence_score=prediction['confidence'],
+            satellite_features=features,
+            processing_time_ms=0,
+            cache_hit=False,
+            coordinates={'latitude': 0, 'longitude': 0},
+            region_info={'climate_zone': 'Manual Input'}
+        )
         
-        return render_template('index_ultra_integrated.html',
+        return render_template(INDEX_TEMPLATE,
                              result=response,
                              input_method='manual')
         
     except Exception as e:
-        logger.error(f"Manual prediction failed: {e}")
-        return render_template('index_ultra_integrated.html',
+        logger.error("Manual prediction failed: %s", e)
+        return render_template(INDEX_TEMPLATE,
                              error=f"Manual prediction failed: {str(e)}")
 
+# Test locations around the world, and their requests, built once at import
+_TEST_LOCATIONS = (
+    ('California Agriculture', 39.0372, -121.8036),
+    ('Iowa Corn Belt', 42.0308, -93.6319),
+    ('India Rice Region', 26.8467, 80.9462),
+    ('Brazil Soybean', -14.2350, -51.9253)
+)
+_TEST_REQUESTS = tuple(
+    CropRecommendationRequest(latitude=lat, longitude=lon, year=2024, use_cache=False)  # Force fresh data for testing
+    for _, lat, lon in _TEST_LOCATIONS
+)
+
 @app.route('/api/test_integration', methods=['GET'])
 def test_integration():
     """Test the integration with sample data"""
+    bridge = get_bridge()
     try:
         if bridge is None:
             return jsonify({'error': 'Bridge not available'}), 500
         
-        # Test locations around the world
-        test_locations = [
-            {'name': 'California Agriculture', 'lat': 39.0372, 'lon': -121.8036},
-            {'name': 'Iowa Corn Belt', 'lat': 42.0308, 'lon': -93.6319},
-            {'name': 'India Rice Region', 'lat': 26.8467, 'lon': 80.9462},
-            {'name': 'Brazil Soybean', 'lat': -14.2350, 'lon': -51.9253}
-        ]
+        # One batch pass over the fixed test locations; advice isn't reported here
+        responses = bridge.get_crop_recommendations_batch(list(_TEST_REQUESTS), generate_advice=False)
         
         results = []
-        for location in test_locations:
-            try:
-                req = CropRecommendationRequest(
-                    latitude=location['lat'],
-                    longitude=location['lon'],
-                    year=2024,
-                    use_cache=False  # Force fresh data for testing
-                )
-                
-                response = bridge.get_crop_recommendation(req)
-                
+        for (name, lat, lon), response in zip(_TEST_LOCATIONS, responses):
+            if isinstance(response, Exception):
                 results.append({
-                    'location': location['name'],
-                    'coordinates': f"{location['lat']}, {location['lon']}",
+                    'location': name,
+                    'error': str(response)
+                })
+            else:
+                results.append({
+                    'location': name,
+                    'coordinates': f"{lat}, {lon}",
                     'recommended_crop': response.recommended_crop,
                     'confidence': f"{response.confidence_score:.2f}",
                     'processing_time_ms': f"{response.processing_time_ms:.1f}",
                     'data_sources': response.data_sources,
                     'climate_zone': response.region_info.get('climate_zone', 'Unknown')
                 })
-                
-            except Exception as e:
-                results.append({
-                    'location': location['name'],
-                    'error': str(e)
-                })
         
         return jsonify({
             'integration_test': 'completed',
@@ -749,6 +1037,7 @@ if __name__ == "__main__":
     print("🚀 Starting Ultra-Integrated Crop Recommendation System")
     print("=" * 60)
     
+    bridge = get_bridge()
     if bridge is None:
         print("❌ Warning: Integration bridge failed to initialize")
         print("   The system will run with limited functionality")
@@ -771,11 +1060,16 @@ if __name__ == "__main__":
     print(f"   📍 Click anywhere on the world map")
     print(f"   🛰️  Get instant satellite-based crop recommendations!")
     
+    # The built-in server is for development only; debug (reloader + debugger) is opt-in
+    debug = os.environ.get('FLASK_DEBUG') == '1'
+    print(f"\n⚙️  Development server (debug={'on' if debug else 'off'}). For production run:")
+    print(f"   gunicorn -k gthread --workers 1 --threads 8 -b 0.0.0.0:{port} --chdir src/web app_ultra_integrated:app")
+    
     try:
-        app.run(debug=True, host='0.0.0.0', port=port, threaded=True)
+        app.run(debug=debug, host='0.0.0.0', port=port)
     except OSError as e:
         if "Address already in use" in str(e):
             print(f"\n❌ Port {port} is also in use. Trying port {port+1}...")
-            app.run(debug=True, host='0.0.0.0', port=port+1, threaded=True)
+            app.run(debug=debug, host='0.0.0.0', port=port+1)
         else:
             raise
\ No newline at end of file
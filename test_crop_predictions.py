@@ -6,6 +6,7 @@ Test crop predictions for different locations
 import os
 import logging
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Set up logging
@@ -20,6 +21,13 @@ project_root = Path(__file__).parent
 src_path = project_root / "src"
 sys.path.insert(0, str(src_path))
 
+# Unique crops needed for the diversity check to pass
+MIN_UNIQUE_CROPS = 3
+
+# FAST_MODE=1 stops predicting once MIN_UNIQUE_CROPS crops have been seen;
+# leave it unset for the full per-location table
+FAST_MODE = os.environ.get('FAST_MODE') == '1'
+
 def test_crop_predictions():
     """Test that different locations produce different crop predictions"""
     print("🧪 Testing Crop Predictions Across Locations")
@@ -45,24 +53,46 @@ def test_crop_predictions():
         print("\nCrop predictions for different locations:")
         print("-" * 60)
         
-        predictions = []
-        for lat, lon, name in test_locations:
-            request = CropRecommendationRequest(
+        requests = [
+            CropRecommendationRequest(
                 latitude=lat,
                 longitude=lon,
                 year=2024,
-                use_cache=False  # Force fresh predictions
+                # The model always re-runs; the cache only holds extracted features, so
+                # FAST_MODE reuses them while the full run forces fresh extraction
+                use_cache=FAST_MODE
             )
-            
-            response = bridge.get_crop_recommendation(request)
+            for lat, lon, _ in test_locations
+        ]
+        
+        if FAST_MODE:
+            # Stop as soon as the diversity threshold is met, skipping remaining lookups
+            responses = []
+            seen_crops = set()
+            for request in requests:
+                response = bridge.get_crop_recommendation(request)
+                responses.append(response)
+                seen_crops.add(response.recommended_crop)
+                if len(seen_crops) >= MIN_UNIQUE_CROPS:
+                    break
+        else:
+            # Each recommendation waits on network I/O (Earth Engine, advice generation),
+            # so run them on a small thread pool instead of one after another
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                responses = list(executor.map(bridge.get_crop_recommendation, requests))
+        
+        predictions = []
+        rows = []
+        for (lat, lon, name), response in zip(test_locations, responses):
             predictions.append((name, response.recommended_crop))
             
-            print(f"{name:20} | {response.recommended_crop:15} | Features: N={response.satellite_features['nitrogen']:5.1f} "
-                  f"P={response.satellite_features['phosphorus']:5.1f} K={response.satellite_features['potassium']:5.1f} "
-                  f"T={response.satellite_features['temperature']:5.1f}°C")
+            rows.append(f"{name:20} | {response.recommended_crop:15} | Features: N={response.satellite_features['nitrogen']:5.1f} "
+                        f"P={response.satellite_features['phosphorus']:5.1f} K={response.satellite_features['potassium']:5.1f} "
+                        f"T={response.satellite_features['temperature']:5.1f}°C")
+        print("\n".join(rows))
         
         # Check for crop diversity
-        unique_crops = set([crop for _, crop in predictions])
+        unique_crops = {crop for _, crop in predictions}
         
         print("\n" + "=" * 60)
         print("CROP DIVERSITY ANALYSIS:")
@@ -71,7 +101,7 @@ def test_crop_predictions():
         print(f"Unique crops predicted: {len(unique_crops)}")
         print(f"Crop diversity: {unique_crops}")
         
-        if len(unique_crops) >= 3:
+        if len(unique_crops) >= MIN_UNIQUE_CROPS:
             print("\n✅ EXCELLENT DIVERSITY: Multiple different crops predicted!")
             print("   The system is now working correctly with varied predictions")
             return True
@@ -8,6 +8,7 @@ import logging
 import sys
 import numpy as np
 import pickle
+from functools import lru_cache
 from pathlib import Path
 
 # Set up logging
@@ -19,33 +20,38 @@ project_root = Path(__file__).parent
 src_path = project_root / "src"
 sys.path.insert(0, str(src_path))
 
+MODELS_DIR = project_root / "models"
+
+@lru_cache(maxsize=1)
+def _load_artifacts():
+    """Model, MinMax scaler and Standard scaler, unpickled once per process"""
+    artifacts = []
+    for name in ('model.pkl', 'minmaxscaler_fixed.pkl', 'standscaler_fixed.pkl'):
+        with open(MODELS_DIR / name, 'rb') as f:
+            artifacts.append(pickle.load(f))
+    return tuple(artifacts)
+
 def test_ml_model_directly():
     """Test the ML model with different feature sets"""
     print("🧪 Testing ML Model Directly")
     print("=" * 50)
     
     try:
-        # Load the model and scalers directly
-        models_dir = project_root / "models"
+        from core.integration_bridge import FusedScaler
         
-        with open(models_dir / 'model.pkl', 'rb') as f:
-            model = pickle.load(f)
-        
-        with open(models_dir / 'minmaxscaler_fixed.pkl', 'rb') as f:
-            minmax_scaler = pickle.load(f)
-            
-        with open(models_dir / 'standscaler_fixed.pkl', 'rb') as f:
-            standard_scaler = pickle.load(f)
+        # Load the model and scalers directly
+        model, minmax_scaler, standard_scaler = _load_artifacts()
         
-        # Crop mapping
-        crop_dict = {
-            1: "Rice", 2: "Maize", 3: "Jute", 4: "Cotton", 5: "Coconut", 
-            6: "Papaya", 7: "Orange", 8: "Apple", 9: "Muskmelon", 
-            10: "Watermelon", 11: "Grapes", 12: "Mango", 13: "Banana",
-            14: "Pomegranate", 15: "Lentil", 16: "Blackgram", 17: "Mungbean", 
-            18: "Mothbeans", 19: "Pigeonpeas", 20: "Kidneybeans", 
-            21: "Chickpea", 22: "Coffee"
-        }
+        # Crop mapping, indexed by class id (slot 0 is "Unknown")
+        crop_names = np.array([
+            "Unknown",
+            "Rice", "Maize", "Jute", "Cotton", "Coconut",
+            "Papaya", "Orange", "Apple", "Muskmelon",
+            "Watermelon", "Grapes", "Mango", "Banana",
+            "Pomegranate", "Lentil", "Blackgram", "Mungbean",
+            "Mothbeans", "Pigeonpeas", "Kidneybeans",
+            "Chickpea", "Coffee"
+        ], dtype=object)
         
         print("✅ Model and scalers loaded successfully")
         
@@ -70,31 +76,39 @@ def test_ml_model_directly():
         print(f"{'Test Case':<15} | {'Prediction':<12} | {'Class':<5} | {'Confidence':<10}")
         print("-" * 70)
         
+        # Scale and predict all test cases in one call each; both scalers are
+        # applied as a single fused affine transform
+        features = np.array([test_case["features"] for test_case in test_cases])
+        fused_scaler = FusedScaler(minmax_scaler, standard_scaler)
+        final_features = fused_scaler.transform(features)
+        
+        if not np.allclose(final_features, standard_scaler.transform(minmax_scaler.transform(features))):
+            print("❌ Fused scaler disagrees with the two-stage scaler pipeline")
+            return False
+        # predict() is classes_[argmax(predict_proba())]; derive it from one pass over the trees
+        probabilities = model.predict_proba(final_features)
+        class_ids = model.classes_.take(probabilities.argmax(axis=1))
+        confidences = probabilities.max(axis=1)
+        known = (class_ids > 0) & (class_ids < len(crop_names))
+        predicted_crops = crop_names[np.where(known, class_ids, 0)]
+        
         predictions = []
-        for test_case in test_cases:
-            features = np.array(test_case["features"]).reshape(1, -1)
-            
-            # Apply scaling
-            scaled_features = minmax_scaler.transform(features)
-            final_features = standard_scaler.transform(scaled_features)
-            
-            # Make prediction
-            prediction = model.predict(final_features)[0]
-            probabilities = model.predict_proba(final_features)[0]
-            confidence = float(np.max(probabilities))
-            
-            crop_name = crop_dict.get(prediction, "Unknown")
+        rows = []
+        for test_case, prediction, crop_name, confidence in zip(
+            test_cases, class_ids, predicted_crops, confidences.tolist()
+        ):
             predictions.append((test_case["name"], crop_name, prediction, confidence))
             
-            print(f"{test_case['name']:<15} | {crop_name:<12} | {prediction:<5} | {confidence:<10.3f}")
+            rows.append(f"{test_case['name']:<15} | {crop_name:<12} | {prediction:<5} | {confidence:<10.3f}")
+        print("\n".join(rows))
         
         # Analyze results
         print("\n" + "=" * 70)
         print("ANALYSIS:")
         print("=" * 70)
         
-        unique_predictions = set([pred[1] for pred in predictions])
-        unique_classes = set([pred[2] for pred in predictions])
+        unique_predictions = {pred[1] for pred in predictions}
+        unique_classes = {pred[2] for pred in predictions}
         
         print(f"Unique crops predicted: {len(unique_predictions)}")
         print(f"Unique class IDs: {len(unique_classes)}")
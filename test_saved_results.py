@@ -114,8 +114,10 @@ def test_saved_results_feature():
     print("6. Testing alternative crops...")
     if saved_result.alternative_crops:
         print(f"   ✅ Alternative crops: {len(saved_result.alternative_crops)}")
-        for crop, confidence in saved_result.alternative_crops:
-            print(f"      - {crop}: {confidence:.1f}% suitable")
+        print("\n".join(
+            f"      - {crop}: {confidence:.1f}% suitable"
+            for crop, confidence in saved_result.alternative_crops
+        ))
     
     print("\n🎉 All tests passed! The saved analysis results feature is working correctly.")
     print("\n📋 Feature Summary:")